@@ -0,0 +1,39 @@
+import { createStore, serveStore } from "./shared_store.js";
+
+// Usage: bun run cluster.js <server script>
+// Starts WORKERS copies of the server (default: one per available CPU) as
+// separate processes. Each one listens on the same port with reusePort, so
+// the kernel spreads connections across them, and the primary holds the
+// users store they all read and write.
+const script = Bun.argv[2];
+const workers = Number(process.env.WORKERS) || navigator.hardwareConcurrency;
+
+if (!script) {
+  console.error("Usage: bun run cluster.js <server script>");
+  process.exit(1);
+}
+
+const store = createStore();
+const children = [];
+
+for (let i = 0; i < workers; i++) {
+  children.push(
+    Bun.spawn([process.execPath, script], {
+      stdio: ["inherit", "inherit", "inherit"],
+      ipc: serveStore(store),
+      onExit(child, code, signal) {
+        console.error(`Worker ${child.pid} exited (${signal ?? code})`);
+      },
+    })
+  );
+}
+
+// Take the workers down with the primary
+for (const signal of ["SIGINT", "SIGTERM"]) {
+  process.on(signal, () => {
+    for (const child of children) child.kill();
+    process.exit(0);
+  });
+}
+
+console.log(`Primary ${process.pid} started ${workers} ${script} worker(s)`);
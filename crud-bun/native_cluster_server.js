@@ -0,0 +1,92 @@
+import { openStore } from "./shared_store.js";
+
+const PORT = 3017;
+
+// Fake database, shared by every worker
+const users = openStore();
+
+// Helper to send JSON response
+const sendJSON = (status, data) => {
+  return new Response(JSON.stringify(data), {
+    status,
+    headers: { "Content-Type": "application/json" },
+  });
+};
+
+// Request handler
+const handler = async (req) => {
+  const url = new URL(req.url);
+  const path = url.pathname;
+  const method = req.method;
+
+  try {
+    // POST /users - CREATE
+    if (method === "POST" && path === "/users") {
+      const { name, email } = await req.json();
+
+      if (!name || !email) {
+        return sendJSON(400, { message: "Name and email are required" });
+      }
+
+      const user = await users.create({ name, email });
+      return sendJSON(201, user);
+    }
+
+    // GET /users - READ ALL
+    if (method === "GET" && path === "/users") {
+      const limit = Number(url.searchParams.get("limit") ?? 100);
+      const offset = Number(url.searchParams.get("offset") ?? 0);
+
+      return sendJSON(200, await users.list(limit, offset));
+    }
+
+    // GET /users/:id - READ ONE
+    if (method === "GET" && path.startsWith("/users/")) {
+      const id = Number(path.split("/")[2]);
+      const user = await users.get(id);
+
+      if (!user) {
+        return sendJSON(404, { message: "User not found" });
+      }
+
+      return sendJSON(200, user);
+    }
+
+    // PUT /users/:id - UPDATE
+    if (method === "PUT" && path.startsWith("/users/")) {
+      const id = Number(path.split("/")[2]);
+      if (!(await users.get(id))) {
+        return sendJSON(404, { message: "User not found" });
+      }
+
+      const user = await users.update(id, await req.json());
+
+      // Another worker may have deleted the user while the body was read
+      if (!user) {
+        return sendJSON(404, { message: "User not found" });
+      }
+
+      return sendJSON(200, user);
+    }
+
+    // DELETE /users/:id - DELETE
+    if (method === "DELETE" && path.startsWith("/users/")) {
+      const id = Number(path.split("/")[2]);
+
+      if (!(await users.delete(id))) {
+        return sendJSON(404, { message: "User not found" });
+      }
+
+      return new Response(null, { status: 204 });
+    }
+
+    // 404 - Route not found
+    return sendJSON(404, { message: "Route not found" });
+  } catch (error) {
+    return sendJSON(500, { message: "Internal server error" });
+  }
+};
+
+// Start server; every worker binds the port with reusePort
+Bun.serve({ port: PORT, reusePort: true, fetch: handler });
+console.log(`Worker ${process.pid} is running on http://localhost:${PORT}`);
@@ -0,0 +1,29 @@
+import { createStore, serveStore } from "./shared_store.js";
+
+// Usage: deno run --allow-net --allow-env --allow-read cluster.js <server script>
+// Starts WORKERS copies of the server (default: one per available CPU). Deno
+// cannot fork a process with an IPC channel, so, like `deno serve --parallel`,
+// each worker is a Web Worker: its own isolate and event loop on its own
+// thread. The workers listen on the same port with reusePort, so the kernel
+// spreads connections across them, and the main thread holds the users store
+// they all read and write.
+const script = Deno.args[0];
+const workers = Number(Deno.env.get("WORKERS")) || navigator.hardwareConcurrency;
+
+if (!script) {
+  console.error("Usage: deno run --allow-net --allow-env --allow-read cluster.js <server script>");
+  Deno.exit(1);
+}
+
+const store = createStore();
+const url = new URL(script, import.meta.url);
+
+for (let i = 0; i < workers; i++) {
+  const worker = new Worker(url, { type: "module" });
+  worker.addEventListener("error", (event) => {
+    console.error(`Worker ${i} failed: ${event.message}`);
+  });
+  serveStore(worker, store);
+}
+
+console.log(`Started ${workers} ${script} worker(s)`);
@@ -0,0 +1,66 @@
+import { Hono } from "hono";
+import { openStore } from "./shared_store.js";
+
+const PORT = 3015;
+const app = new Hono();
+
+// Shared by every worker
+const users = openStore();
+
+app.post("/users", async (c) => {
+  const { name, email } = await c.req.json();
+
+  if (!name || !email) {
+    return c.json({ message: "Name and email are required" }, 400);
+  }
+
+  const user = await users.create({ name, email });
+  return c.json(user, 201);
+});
+
+app.get("/users", async (c) => {
+  const limit = Number(c.req.query("limit") ?? 100);
+  const offset = Number(c.req.query("offset") ?? 0);
+
+  return c.json(await users.list(limit, offset));
+});
+
+app.get("/users/:id", async (c) => {
+  const id = Number(c.req.param("id"));
+  const user = await users.get(id);
+
+  if (!user) {
+    return c.json({ message: "User not found" }, 404);
+  }
+
+  return c.json(user);
+});
+
+app.put("/users/:id", async (c) => {
+  const id = Number(c.req.param("id"));
+  if (!(await users.get(id))) {
+    return c.json({ message: "User not found" }, 404);
+  }
+
+  const user = await users.update(id, await c.req.json());
+
+  // Another worker may have deleted the user while the body was read
+  if (!user) {
+    return c.json({ message: "User not found" }, 404);
+  }
+
+  return c.json(user);
+});
+
+app.delete("/users/:id", async (c) => {
+  const id = Number(c.req.param("id"));
+
+  if (!(await users.delete(id))) {
+    return c.json({ message: "User not found" }, 404);
+  }
+
+  return c.body(null, 204);
+});
+
+// Every worker binds the port with reusePort
+Deno.serve({ port: PORT, reusePort: true }, app.fetch);
@@ -0,0 +1,28 @@
+import cluster from "cluster";
+import { availableParallelism } from "os";
+import { createStore, serveStore } from "./shared_store.js";
+
+// Usage: node cluster.js <server script>
+// Starts WORKERS copies of the server (default: one per available CPU). The
+// workers share the listening port through cluster, and the primary holds
+// the users store they all read and write.
+const script = process.argv[2];
+const workers = Number(process.env.WORKERS) || availableParallelism();
+
+if (!script) {
+  console.error("Usage: node cluster.js <server script>");
+  process.exit(1);
+}
+
+const store = createStore();
+cluster.setupPrimary({ exec: script });
+
+for (let i = 0; i < workers; i++) {
+  serveStore(cluster.fork(), store);
+}
+
+cluster.on("exit", (worker, code, signal) => {
+  console.error(`Worker ${worker.process.pid} exited (${signal ?? code})`);
+});
+
+console.log(`Primary ${process.pid} started ${workers} ${script} worker(s)`);
@@ -0,0 +1,64 @@
+import express from "express";
+import { openStore } from "./shared_store.js";
+
+const PORT = 3013;
+const app = express();
+
+app.use(express.json());
+
+// Shared by every worker
+const users = openStore();
+
+app.post("/users", async (req, res) => {
+  const { name, email } = req.body;
+
+  if (!name || !email) {
+    return res.status(400).json({ message: "Name and email are required" });
+  }
+
+  const user = await users.create({ name, email });
+  return res.status(201).json(user);
+});
+
+app.get("/users", async (req, res) => {
+  const limit = Number(req.query.limit ?? 100);
+  const offset = Number(req.query.offset ?? 0);
+
+  return res.json(await users.list(limit, offset));
+});
+
+app.get("/users/:id", async (req, res) => {
+  const id = Number(req.params.id);
+  const user = await users.get(id);
+
+  if (!user) {
+    return res.status(404).json({ message: "User not found" });
+  }
+
+  return res.json(user);
+});
+
+app.put("/users/:id", async (req, res) => {
+  const id = Number(req.params.id);
+  const user = await users.update(id, req.body);
+
+  if (!user) {
+    return res.status(404).json({ message: "User not found" });
+  }
+
+  return res.json(user);
+});
+
+app.delete("/users/:id", async (req, res) => {
+  const id = Number(req.params.id);
+
+  if (!(await users.delete(id))) {
+    return res.status(404).json({ message: "User not found" });
+  }
+
+  return res.status(204).send();
+});
+
+app.listen(PORT, () => {
+  console.log(`Worker ${process.pid} is running on http://localhost:${PORT}`);
+});
@@ -0,0 +1,111 @@
+import { createServer } from "http";
+import { openStore } from "./shared_store.js";
+
+const PORT = 3011;
+
+// Fake database, shared by every worker
+const users = openStore();
+
+// Helper to parse JSON body
+const parseBody = (req) => {
+  return new Promise((resolve, reject) => {
+    let body = "";
+    req.on("data", (chunk) => {
+      body += chunk.toString();
+    });
+    req.on("end", () => {
+      try {
+        resolve(body ? JSON.parse(body) : {});
+      } catch (error) {
+        reject(error);
+      }
+    });
+    req.on("error", reject);
+  });
+};
+
+// Helper to send JSON response
+const sendJSON = (res, statusCode, data) => {
+  res.writeHead(statusCode, { "Content-Type": "application/json" });
+  res.end(JSON.stringify(data));
+};
+
+// Router
+const server = createServer(async (req, res) => {
+  const url = new URL(req.url, `http://${req.headers.host}`);
+  const path = url.pathname;
+  const method = req.method;
+
+  try {
+    // POST /users - CREATE
+    if (method === "POST" && path === "/users") {
+      const { name, email } = await parseBody(req);
+
+      if (!name || !email) {
+        return sendJSON(res, 400, { message: "Name and email are required" });
+      }
+
+      const user = await users.create({ name, email });
+      return sendJSON(res, 201, user);
+    }
+
+    // GET /users - READ ALL
+    if (method === "GET" && path === "/users") {
+      const limit = Number(url.searchParams.get("limit") ?? 100);
+      const offset = Number(url.searchParams.get("offset") ?? 0);
+
+      return sendJSON(res, 200, await users.list(limit, offset));
+    }
+
+    // GET /users/:id - READ ONE
+    if (method === "GET" && path.startsWith("/users/")) {
+      const id = Number(path.split("/")[2]);
+      const user = await users.get(id);
+
+      if (!user) {
+        return sendJSON(res, 404, { message: "User not found" });
+      }
+
+      return sendJSON(res, 200, user);
+    }
+
+    // PUT /users/:id - UPDATE
+    if (method === "PUT" && path.startsWith("/users/")) {
+      const id = Number(path.split("/")[2]);
+      if (!(await users.get(id))) {
+        return sendJSON(res, 404, { message: "User not found" });
+      }
+
+      const user = await users.update(id, await parseBody(req));
+
+      // Another worker may have deleted the user while the body was read
+      if (!user) {
+        return sendJSON(res, 404, { message: "User not found" });
+      }
+
+      return sendJSON(res, 200, user);
+    }
+
+    // DELETE /users/:id - DELETE
+    if (method === "DELETE" && path.startsWith("/users/")) {
+      const id = Number(path.split("/")[2]);
+
+      if (!(await users.delete(id))) {
+        return sendJSON(res, 404, { message: "User not found" });
+      }
+
+      res.writeHead(204);
+      return res.end();
+    }
+
+    // 404 - Route not found
+    sendJSON(res, 404, { message: "Route not found" });
+  } catch (error) {
+    sendJSON(res, 500, { message: "Internal server error" });
+  }
+});
+
+// Start server
+server.listen(PORT, () => {
+  console.log(`Worker ${process.pid} is running on http://localhost:${PORT}`);
+});
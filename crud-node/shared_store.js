@@ -0,0 +1,94 @@
+// Users store for the clustered servers.
+//
+// Each worker has its own heap, so a plain Map per worker would give every
+// worker a different set of users. Instead the primary owns the only Map and
+// workers send each operation to it over the cluster IPC channel. Sticky
+// routing by id is not an option: the primary hands out connections, not
+// requests, so any worker can receive any id.
+
+// In-process store, used by the primary (or by a server started without cluster.js)
+export const createStore = () => {
+  const users = new Map();
+  let nextId = 1;
+
+  return {
+    create({ name, email }) {
+      const user = {
+        id: nextId++,
+        name,
+        email,
+      };
+
+      users.set(user.id, user);
+      return user;
+    },
+
+    list(limit, offset) {
+      const usersArray = Array.from(users.values());
+      return usersArray.slice(offset, offset + limit);
+    },
+
+    get(id) {
+      return users.get(id) ?? null;
+    },
+
+    update(id, { name, email }) {
+      const user = users.get(id);
+
+      if (!user) {
+        return null;
+      }
+
+      if (name) user.name = name;
+      if (email) user.email = email;
+
+      return user;
+    },
+
+    delete(id) {
+      return users.delete(id);
+    },
+  };
+};
+
+// Store whose operations run in the primary; every method returns a Promise
+const connectStore = () => {
+  const pending = new Map();
+  let nextRequest = 1;
+
+  process.on("message", (message) => {
+    const resolve = pending.get(message?.storeReply);
+    if (resolve) {
+      pending.delete(message.storeReply);
+      resolve(message.result);
+    }
+  });
+
+  const call = (operation, ...args) =>
+    new Promise((resolve) => {
+      const request = nextRequest++;
+      pending.set(request, resolve);
+      process.send({ store: operation, request, args });
+    });
+
+  return {
+    create: (fields) => call("create", fields),
+    list: (limit, offset) => call("list", limit, offset),
+    get: (id) => call("get", id),
+    update: (id, fields) => call("update", id, fields),
+    delete: (id) => call("delete", id),
+  };
+};
+
+// The shared store when running as a cluster worker, a local one otherwise
+export const openStore = () => (process.send ? connectStore() : createStore());
+
+// Answer a worker's store operations from the primary's store
+export const serveStore = (worker, store) => {
+  worker.on("message", (message) => {
+    if (message?.store) {
+      const result = store[message.store](...message.args);
+      worker.send({ storeReply: message.request, result });
+    }
+  });
+};
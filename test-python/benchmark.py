@@ -1,8 +1,31 @@
+import argparse
 import asyncio
 import aiohttp
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
 import time
-from typing import List, Dict
-import statistics
+from collections import deque
+from clientmonitor import (PHASES, client_bottlenecks, combine_client_stats, phase_durations, phase_trace_config,
+                           run_monitored)
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from export import build_records, collect_metadata, write_results
+from metrics import IntervalSeries, OperationRecorder, combine, merge_recorders, record_result
+from payload import PAYLOAD_DISTRIBUTIONS, PayloadGenerator, async_chunks, format_size, parse_size
+from rawhttp import RawSession
+from procfs import ProcessSampler, find_server_pid, pin_process, process_tree, read_tree_stats
+from regression import compare_files
+from servers import ManagedServer, can_launch
+from significance import confidence_interval, mean, stdev, welch_t_test
+from workload import KEYED_OPERATIONS, Workload, load_workload
 
 URLS = [
     "http://localhost:3001",  # Node.js
@@ -16,6 +39,21 @@ URLS = [
     "http://localhost:3009",  # Bun
 ]
 
+# Clustered variants: one worker per core sharing a port and a users store
+CLUSTER_URLS = [
+    "http://localhost:3011",  # Node.js
+    "http://localhost:3014",  # Deno
+    "http://localhost:3017",  # Bun
+    "http://localhost:3012",  # Node.js
+    "http://localhost:3015",  # Deno
+    "http://localhost:3018",  # Bun
+    "http://localhost:3013",  # Node.js
+    # Deno and Bun express (3016, 3019) are left out until reusePort is known to work
+    # through their node:http compatibility layers
+]
+
+ALL_URLS = URLS + CLUSTER_URLS
+
 SERVER_NAMES = {
     "http://localhost:3001": "Node.js (native)",
     "http://localhost:3002": "Node.js (hono)",
@@ -26,49 +64,198 @@ SERVER_NAMES = {
     "http://localhost:3007": "Bun (native)",
     "http://localhost:3008": "Bun (hono)",
     "http://localhost:3009": "Bun (express)",
+    "http://localhost:3011": "Node.js (native cluster)",
+    "http://localhost:3012": "Node.js (hono cluster)",
+    "http://localhost:3013": "Node.js (express cluster)",
+    "http://localhost:3014": "Deno (native cluster)",
+    "http://localhost:3015": "Deno (hono cluster)",
+    "http://localhost:3017": "Bun (native cluster)",
+    "http://localhost:3018": "Bun (hono cluster)",
 }
 
+OPERATIONS = ["CREATE", "GET_ALL", "GET_ONE", "UPDATE", "DELETE"]
 
-def calculate_percentile(data: List[float], percentile: float) -> float:
-    """Calculate percentile value from a list of numbers"""
-    if not data:
-        return 0
-    sorted_data = sorted(data)
-    index = (percentile / 100) * (len(sorted_data) - 1)
-    lower = int(index)
-    upper = lower + 1
-    
-    if upper >= len(sorted_data):
-        return sorted_data[-1]
-    
-    weight = index - lower
-    return sorted_data[lower] * (1 - weight) + sorted_data[upper] * weight
+# Operation cycle used by open-loop mode; each arrival issues the next one
+OPEN_LOOP_SEQUENCE = ["CREATE", "GET_ONE", "UPDATE", "DELETE"]
+
+# How each operation handles its response body:
+#   json      decode the full JSON body
+#   id        pull only the "id" field out of the raw body (CREATE needs it)
+#   drain     read and count the bytes without decoding
+#   sample:N  drain, but decode and validate one in every N responses
+DEFAULT_BODY_POLICY = {
+    "CREATE": "id",
+    "GET_ALL": "drain",
+    "GET_ONE": "drain",
+    "UPDATE": "drain",
+    "DELETE": "drain",
+}
+
+BODY_POLICY = dict(DEFAULT_BODY_POLICY)
+
+# Client connection pool settings, changed from the command line through configure_connections.
+# A limit of None sizes the pool to the caller's concurrency; 0 means unlimited.
+DEFAULT_CONNECTION_SETTINGS = {
+    "engine": "aiohttp",
+    "pipeline": 1,
+    "limit": None,
+    "limit_per_host": 0,
+    "keep_alive": True,
+    "dns_cache": True,
+    "trace_phases": False,
+}
+
+CONNECTION_SETTINGS = dict(DEFAULT_CONNECTION_SETTINGS)
+
+_ID_PATTERN = re.compile(rb'"id"\s*:\s*(\d+)')
+_sample_counters: Dict[str, int] = {}
+
+
+def configure_body_policy(policy: Dict[str, str]):
+    """Override the body handling policy for some operations"""
+    for operation, mode in policy.items():
+        if operation not in DEFAULT_BODY_POLICY:
+            raise ValueError(f"Unknown operation: {operation}")
+        if mode.startswith("sample:"):
+            if int(mode.split(":", 1)[1]) < 1:
+                raise ValueError(f"Sample rate must be at least 1: {mode}")
+        elif mode not in ("json", "id", "drain"):
+            raise ValueError(f"Unknown body policy: {mode}")
+        if operation == "CREATE" and mode not in ("json", "id"):
+            raise ValueError("CREATE needs the new user's id, so its policy must be json or id")
+        BODY_POLICY[operation] = mode
+
+
+def parse_body_policy(spec: str) -> Dict[str, str]:
+    """Parse "OPERATION=policy,..." into a policy dict"""
+    policy = {}
+    for item in filter(None, spec.split(",")):
+        operation, _, mode = item.partition("=")
+        policy[operation.strip().upper()] = mode.strip()
+    return policy
+
+
+def configure_connections(settings: Dict):
+    """Replace the active connection pool settings, falling back to the defaults for missing keys"""
+    CONNECTION_SETTINGS.clear()
+    CONNECTION_SETTINGS.update(DEFAULT_CONNECTION_SETTINGS)
+    CONNECTION_SETTINGS.update(settings)
+
+
+def create_session(connections: int) -> aiohttp.ClientSession:
+    """Session whose pool holds enough sockets for `connections` concurrent requests.
+
+    Without this the connector's default limit of 100 would silently queue
+    any extra workers inside the client rather than at the server. With the
+    raw engine this returns a RawSession, which the CRUD functions detect.
+    """
+    limit = CONNECTION_SETTINGS["limit"]
+    if CONNECTION_SETTINGS["engine"] == "raw":
+        return RawSession(
+            limit=connections if limit is None else limit,
+            depth=CONNECTION_SETTINGS["pipeline"],
+            keep_alive=CONNECTION_SETTINGS["keep_alive"],
+        )
+    connector = aiohttp.TCPConnector(
+        limit=connections if limit is None else limit,
+        limit_per_host=CONNECTION_SETTINGS["limit_per_host"],
+        force_close=not CONNECTION_SETTINGS["keep_alive"],
+        use_dns_cache=CONNECTION_SETTINGS["dns_cache"],
+    )
+    trace_configs = [phase_trace_config()] if CONNECTION_SETTINGS["trace_phases"] else None
+    return aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+
+
+def trace_marks() -> Optional[Dict]:
+    """A dict to collect a request's phase timestamps in when --trace-phases is on, else None"""
+    return {} if CONNECTION_SETTINGS["trace_phases"] else None
+
+
+def body_mode(operation: str) -> str:
+    """How to handle this response's body: json, id or drain, resolving sample:N to one of them"""
+    mode = BODY_POLICY[operation]
+    if mode.startswith("sample:"):
+        count = _sample_counters.get(operation, 0)
+        _sample_counters[operation] = count + 1
+        mode = "json" if count % int(mode.split(":", 1)[1]) == 0 else "drain"
+    return mode
+
+
+def decode_body(body: bytes, operation: str, mode: str, status: int):
+    """Decode a complete body under the json or id policy"""
+    if mode == "id":
+        match = _ID_PATTERN.search(body)
+        if not match:
+            raise ValueError(f"No id in {operation} response (status {status})")
+        return {"id": int(match.group(1))}
+    return json.loads(body) if body else None
+
+
+async def read_body(response: aiohttp.ClientResponse, operation: str) -> tuple:
+    """Consume a response body according to the operation's policy and return (data, bytes received)"""
+    mode = body_mode(operation)
+
+    if mode == "drain":
+        received = 0
+        async for chunk in response.content.iter_any():
+            received += len(chunk)
+        return None, received
+
+    body = await response.read()
+    return decode_body(body, operation, mode, response.status), len(body)
+
+
+async def raw_request(session: RawSession, base_url: str, operation: str, request: bytes) -> Dict:
+    """Send a pre-serialised request through the raw engine and return the same result as the aiohttp path"""
+    marks = trace_marks()
+    start = time.perf_counter()
+    try:
+        mode = body_mode(operation)
+        status, body, received = await session.send(base_url, request, keep_body=mode != "drain", marks=marks)
+        data = decode_body(body, operation, mode, status) if mode != "drain" else None
+        duration = time.perf_counter() - start
+        return {"operation": operation, "status": status, "duration": duration, "success": True, "data": data, "bytes": received,
+                "phases": phase_durations(marks, start + duration)}
+    except Exception as e:
+        duration = time.perf_counter() - start
+        return {"operation": operation, "status": 0, "duration": duration, "success": False, "error": str(e)}
 
 
 async def create_user(session: aiohttp.ClientSession, base_url: str, user_id: int) -> Dict:
     """Create a user"""
+    if isinstance(session, RawSession):
+        return await raw_request(session, base_url, "CREATE", session.templates(base_url).create(user_id))
+    marks = trace_marks()
     start = time.perf_counter()
     try:
         async with session.post(
             f"{base_url}/users",
-            json={"name": f"User {user_id}", "email": f"user{user_id}@example.com"}
+            json={"name": f"User {user_id}", "email": f"user{user_id}@example.com"},
+            trace_request_ctx=marks
         ) as response:
-            data = await response.json()
+            data, received = await read_body(response, "CREATE")
             duration = time.perf_counter() - start
-            return {"operation": "CREATE", "status": response.status, "duration": duration, "success": True, "data": data}
+            return {"operation": "CREATE", "status": response.status, "duration": duration, "success": True, "data": data, "bytes": received,
+                    "phases": phase_durations(marks, start + duration)}
     except Exception as e:
         duration = time.perf_counter() - start
         return {"operation": "CREATE", "status": 0, "duration": duration, "success": False, "error": str(e)}
 
 
-async def get_all_users(session: aiohttp.ClientSession, base_url: str) -> Dict:
-    """Get all users"""
+async def get_all_users(session: aiohttp.ClientSession, base_url: str,
+                        limit: Optional[int] = None, offset: Optional[int] = None) -> Dict:
+    """Get all users, or one page of them when limit/offset are given"""
+    if isinstance(session, RawSession):
+        return await raw_request(session, base_url, "GET_ALL", session.templates(base_url).get_all(limit, offset))
+    params = {key: value for key, value in (("limit", limit), ("offset", offset)) if value is not None}
+    marks = trace_marks()
     start = time.perf_counter()
     try:
-        async with session.get(f"{base_url}/users") as response:
-            data = await response.json()
+        async with session.get(f"{base_url}/users", params=params or None, trace_request_ctx=marks) as response:
+            data, received = await read_body(response, "GET_ALL")
             duration = time.perf_counter() - start
-            return {"operation": "GET_ALL", "status": response.status, "duration": duration, "success": True, "data": data}
+            return {"operation": "GET_ALL", "status": response.status, "duration": duration, "success": True, "data": data, "bytes": received,
+                    "phases": phase_durations(marks, start + duration)}
     except Exception as e:
         duration = time.perf_counter() - start
         return {"operation": "GET_ALL", "status": 0, "duration": duration, "success": False, "error": str(e)}
@@ -76,12 +263,16 @@ async def get_all_users(session: aiohttp.ClientSession, base_url: str) -> Dict:
 
 async def get_user(session: aiohttp.ClientSession, base_url: str, user_id: int) -> Dict:
     """Get a single user"""
+    if isinstance(session, RawSession):
+        return await raw_request(session, base_url, "GET_ONE", session.templates(base_url).get_one(user_id))
+    marks = trace_marks()
     start = time.perf_counter()
     try:
-        async with session.get(f"{base_url}/users/{user_id}") as response:
-            data = await response.json()
+        async with session.get(f"{base_url}/users/{user_id}", trace_request_ctx=marks) as response:
+            data, received = await read_body(response, "GET_ONE")
             duration = time.perf_counter() - start
-            return {"operation": "GET_ONE", "status": response.status, "duration": duration, "success": True, "data": data}
+            return {"operation": "GET_ONE", "status": response.status, "duration": duration, "success": True, "data": data, "bytes": received,
+                    "phases": phase_durations(marks, start + duration)}
     except Exception as e:
         duration = time.perf_counter() - start
         return {"operation": "GET_ONE", "status": 0, "duration": duration, "success": False, "error": str(e)}
@@ -89,15 +280,20 @@ async def get_user(session: aiohttp.ClientSession, base_url: str, user_id: int)
 
 async def update_user(session: aiohttp.ClientSession, base_url: str, user_id: int) -> Dict:
     """Update a user"""
+    if isinstance(session, RawSession):
+        return await raw_request(session, base_url, "UPDATE", session.templates(base_url).update(user_id))
+    marks = trace_marks()
     start = time.perf_counter()
     try:
         async with session.put(
             f"{base_url}/users/{user_id}",
-            json={"name": f"Updated User {user_id}"}
+            json={"name": f"Updated User {user_id}"},
+            trace_request_ctx=marks
         ) as response:
-            data = await response.json()
+            data, received = await read_body(response, "UPDATE")
             duration = time.perf_counter() - start
-            return {"operation": "UPDATE", "status": response.status, "duration": duration, "success": True, "data": data}
+            return {"operation": "UPDATE", "status": response.status, "duration": duration, "success": True, "data": data, "bytes": received,
+                    "phases": phase_durations(marks, start + duration)}
     except Exception as e:
         duration = time.perf_counter() - start
         return {"operation": "UPDATE", "status": 0, "duration": duration, "success": False, "error": str(e)}
@@ -105,96 +301,245 @@ async def update_user(session: aiohttp.ClientSession, base_url: str, user_id: in
 
 async def delete_user(session: aiohttp.ClientSession, base_url: str, user_id: int) -> Dict:
     """Delete a user"""
+    if isinstance(session, RawSession):
+        return await raw_request(session, base_url, "DELETE", session.templates(base_url).delete(user_id))
+    marks = trace_marks()
     start = time.perf_counter()
     try:
-        async with session.delete(f"{base_url}/users/{user_id}") as response:
+        async with session.delete(f"{base_url}/users/{user_id}", trace_request_ctx=marks) as response:
+            _, received = await read_body(response, "DELETE")
             duration = time.perf_counter() - start
-            return {"operation": "DELETE", "status": response.status, "duration": duration, "success": True}
+            return {"operation": "DELETE", "status": response.status, "duration": duration, "success": True, "bytes": received,
+                    "phases": phase_durations(marks, start + duration)}
     except Exception as e:
         duration = time.perf_counter() - start
         return {"operation": "DELETE", "status": 0, "duration": duration, "success": False, "error": str(e)}
 
 
-async def check_server(base_url: str) -> bool:
+async def send_payload(session: aiohttp.ClientSession, base_url: str, operation: str, user_id: Optional[int],
+                       body: bytes, chunk_size: Optional[int] = None) -> Dict:
+    """CREATE or UPDATE with a prepared JSON body, sent with chunked transfer encoding when chunk_size is given.
+
+    Unlike the other request functions, an HTTP error status counts as a
+    failure, since large bodies are often rejected with 413.
+    """
+    if isinstance(session, RawSession):
+        request = session.templates(base_url).payload(operation, user_id, body, chunk_size)
+        result = await raw_request(session, base_url, operation, request)
+    else:
+        method, path = ("POST", "/users") if operation == "CREATE" else ("PUT", f"/users/{user_id}")
+        data = async_chunks(body, chunk_size) if chunk_size else body
+        marks = trace_marks()
+        start = time.perf_counter()
+        try:
+            async with session.request(method, f"{base_url}{path}", data=data,
+                                       headers={"Content-Type": "application/json"},
+                                       trace_request_ctx=marks) as response:
+                data, received = await read_body(response, operation)
+                duration = time.perf_counter() - start
+                result = {"operation": operation, "status": response.status, "duration": duration, "success": True, "data": data, "bytes": received,
+                          "phases": phase_durations(marks, start + duration)}
+        except Exception as e:
+            duration = time.perf_counter() - start
+            result = {"operation": operation, "status": 0, "duration": duration, "success": False, "error": str(e)}
+    if result["success"] and result["status"] >= 400:
+        result["success"] = False
+        result["error"] = f"HTTP {result['status']}"
+    return result
+
+
+async def check_server(session: aiohttp.ClientSession, base_url: str) -> bool:
     """Check if server is running"""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{base_url}/users", timeout=aiohttp.ClientTimeout(total=2)) as response:
-                return response.status == 200
+        async with session.get(f"{base_url}/users", timeout=aiohttp.ClientTimeout(total=2)) as response:
+            return response.status == 200
     except:
         return False
 
 
-async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int = 10):
-    """Run benchmark tests for a single server"""
-    server_name = SERVER_NAMES.get(base_url, base_url)
-    
-    print(f"\n{'='*70}")
-    print(f"API Performance Benchmark - {server_name}")
-    print(f"{'='*70}")
-    print(f"Target: {base_url}")
-    print(f"Total Requests per Operation: {num_requests}")
-    print(f"Concurrent Requests: {concurrent}")
-    print(f"{'='*70}\n")
+async def run_with_workers(request_fn, args_list: List[tuple], concurrent: int,
+                           recorder: OperationRecorder, on_success=None):
+    """Run requests through a fixed pool of workers so exactly `concurrent` stay in flight"""
+    next_index = 0
 
-    async with aiohttp.ClientSession() as session:
+    async def worker():
+        nonlocal next_index
+        while next_index < len(args_list):
+            index = next_index
+            next_index += 1
+            result = await request_fn(*args_list[index])
+            recorder.record(result)
+            if on_success and result["success"]:
+                on_success(result)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrent, len(args_list)))))
+    return recorder
+
+
+def split_evenly(total: int, parts: int) -> List[int]:
+    """Split total into parts whose sizes differ by at most one"""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+# Barrier and live interval queue shared by the worker processes of a sharded run, set by _init_shard
+_shard_barrier = None
+_shard_intervals = None
+
+
+def _init_shard(barrier, interval_queue, body_policy: Dict[str, str], connection_settings: Dict):
+    global _shard_barrier, _shard_intervals
+    _shard_barrier = barrier
+    _shard_intervals = interval_queue
+    configure_body_policy(body_policy)
+    configure_connections(connection_settings)
+
+
+def _send_interval(index: int, recorders: Dict[str, OperationRecorder]):
+    _shard_intervals.put((index, recorders))
+
+
+def wait_for_shards(barrier):
+    """Block until every process of a sharded run reaches the same point"""
+    if barrier is not None:
+        barrier.wait()
+
+
+def collect_shard_intervals(interval_queue, processes: int, on_interval):
+    """Merge the live intervals sent by each shard and pass each one on once every shard has reported it"""
+    pending = {}
+    finished = 0
+    while finished < processes:
+        item = interval_queue.get()
+        if item is None:
+            finished += 1
+            continue
+        index, recorders = item
+        pending.setdefault(index, []).append(recorders)
+        if len(pending[index]) == processes:
+            on_interval(index, merge_recorders(*pending.pop(index)))
+    # Shards that stopped early never report their last intervals
+    for index in sorted(pending):
+        on_interval(index, merge_recorders(*pending[index]))
+
+
+async def run_sharded(shard_fn, shard_args: List[tuple], on_interval=None, on_start=None) -> List:
+    """Run shard_fn once per argument tuple, each in its own process with its own event loop.
+
+    Shards that report live intervals through _send_interval have them merged
+    across processes and handed to on_interval. on_start is called once every
+    shard has passed its start barrier.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    # The parent joins the shards' barrier when it needs to know when they start
+    barrier = ctx.Barrier(len(shard_args) + (1 if on_start else 0))
+    interval_queue = ctx.Queue()
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=len(shard_args), mp_context=ctx, initializer=_init_shard,
+                             initargs=(barrier, interval_queue, dict(BODY_POLICY), dict(CONNECTION_SETTINGS))) as pool:
+        collector = None
+        if on_interval:
+            collector = loop.run_in_executor(
+                None, collect_shard_intervals, interval_queue, len(shard_args), on_interval
+            )
+        shards = [loop.run_in_executor(pool, shard_fn, *args) for args in shard_args]
+        if on_start:
+            await loop.run_in_executor(None, barrier.wait)
+            on_start()
+        results = await asyncio.gather(*shards)
+        if collector:
+            await collector
+        return results
+
+
+def print_interval(index: int, recorders: Dict[str, OperationRecorder], interval_seconds: float, warmup_seconds: float):
+    """Print one live interval: throughput, errors and p50/p99 (ms) per operation"""
+    overall = combine(recorders.values(), precision=0.05)
+    elapsed = (index + 1) * interval_seconds
+    label = " warm-up" if elapsed <= warmup_seconds else ""
+    operations = "  ".join(
+        f"{operation} {recorder.histogram.percentile(50):.1f}/{recorder.histogram.percentile(99):.1f}"
+        for operation, recorder in sorted(recorders.items(), key=lambda item: OPERATIONS.index(item[0]))
+    )
+    print(f"  [{elapsed:>6.1f}s{label:<8}] {overall.successful / interval_seconds:>9.0f} req/s  "
+          f"err {overall.failed:<5} {operations}")
+
+
+async def report_intervals(series: IntervalSeries, on_interval):
+    """Hand each interval's recorders to on_interval as soon as the interval has ended"""
+    index = 0
+    try:
+        while True:
+            await asyncio.sleep(max(0, series.interval_end(index) - time.perf_counter()))
+            on_interval(index, series.get(index))
+            index += 1
+    except asyncio.CancelledError:
+        # Flush the intervals that were still open when the run finished
+        for remaining in range(index, series.last_index + 1):
+            on_interval(remaining, series.get(remaining))
+        raise
+
+
+async def stop_reporter(reporter: asyncio.Task):
+    reporter.cancel()
+    with suppress(asyncio.CancelledError):
+        await reporter
+
+
+async def execute_benchmark(base_url: str, num_requests: int, concurrent: int,
+                            first_id: int = 1, barrier=None, verbose: bool = True) -> Dict:
+    """Run the five CRUD phases and return each phase's recorder and wall time"""
+    log = print if verbose else (lambda *args: None)
+
+    async with create_session(concurrent) as session:
         # Test 1: CREATE users concurrently
-        print("Test 1: CREATE operations...")
+        wait_for_shards(barrier)
+        log("Test 1: CREATE operations...")
         operation_start = time.perf_counter()
-        tasks = [create_user(session, base_url, i + 1) for i in range(num_requests)]
-        create_results = []
-        for i in range(0, num_requests, concurrent):
-            batch_tasks = tasks[i:i+concurrent]
-            batch_results = await asyncio.gather(*batch_tasks)
-            create_results.extend(batch_results)
+        created_ids = []
+        create_results = await run_with_workers(
+            create_user, [(session, base_url, first_id + i) for i in range(num_requests)], concurrent,
+            OperationRecorder(), on_success=lambda result: created_ids.append(result["data"]["id"])
+        )
         create_wall_time = time.perf_counter() - operation_start
         
         # Test 2: GET all users
-        print("Test 2: GET ALL operations...")
+        wait_for_shards(barrier)
+        log("Test 2: GET ALL operations...")
         operation_start = time.perf_counter()
-        tasks = [get_all_users(session, base_url) for _ in range(num_requests)]
-        get_all_results = []
-        for i in range(0, num_requests, concurrent):
-            batch_tasks = tasks[i:i+concurrent]
-            batch_results = await asyncio.gather(*batch_tasks)
-            get_all_results.extend(batch_results)
+        get_all_results = await run_with_workers(
+            get_all_users, [(session, base_url) for _ in range(num_requests)], concurrent, OperationRecorder()
+        )
         get_all_wall_time = time.perf_counter() - operation_start
         
         # Test 3: GET individual users
-        print("Test 3: GET ONE operations...")
+        wait_for_shards(barrier)
+        log("Test 3: GET ONE operations...")
         operation_start = time.perf_counter()
-        tasks = [get_user(session, base_url, result["data"]["id"]) for result in create_results if result["success"]]
-        get_one_results = []
-        for i in range(0, len(tasks), concurrent):
-            batch_tasks = tasks[i:i+concurrent]
-            batch_results = await asyncio.gather(*batch_tasks)
-            get_one_results.extend(batch_results)
+        get_one_results = await run_with_workers(
+            get_user, [(session, base_url, user_id) for user_id in created_ids], concurrent, OperationRecorder()
+        )
         get_one_wall_time = time.perf_counter() - operation_start
         
         # Test 4: UPDATE users
-        print("Test 4: UPDATE operations...")
+        wait_for_shards(barrier)
+        log("Test 4: UPDATE operations...")
         operation_start = time.perf_counter()
-        tasks = [update_user(session, base_url, result["data"]["id"]) for result in create_results if result["success"]]
-        update_results = []
-        for i in range(0, len(tasks), concurrent):
-            batch_tasks = tasks[i:i+concurrent]
-            batch_results = await asyncio.gather(*batch_tasks)
-            update_results.extend(batch_results)
+        update_results = await run_with_workers(
+            update_user, [(session, base_url, user_id) for user_id in created_ids], concurrent, OperationRecorder()
+        )
         update_wall_time = time.perf_counter() - operation_start
         
         # Test 5: DELETE users
-        print("Test 5: DELETE operations...")
+        wait_for_shards(barrier)
+        log("Test 5: DELETE operations...")
         operation_start = time.perf_counter()
-        tasks = [delete_user(session, base_url, result["data"]["id"]) for result in create_results if result["success"]]
-        delete_results = []
-        for i in range(0, len(tasks), concurrent):
-            batch_tasks = tasks[i:i+concurrent]
-            batch_results = await asyncio.gather(*batch_tasks)
-            delete_results.extend(batch_results)
+        delete_results = await run_with_workers(
+            delete_user, [(session, base_url, user_id) for user_id in created_ids], concurrent, OperationRecorder()
+        )
         delete_wall_time = time.perf_counter() - operation_start
 
     # Combine all results with wall times
-    all_results = {
+    return {
         "CREATE": (create_results, create_wall_time),
         "GET_ALL": (get_all_results, get_all_wall_time),
         "GET_ONE": (get_one_results, get_one_wall_time),
@@ -202,6 +547,44 @@ async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int
         "DELETE": (delete_results, delete_wall_time),
     }
 
+
+def _benchmark_shard(base_url: str, num_requests: int, concurrent: int, first_id: int, verbose: bool) -> Dict:
+    return asyncio.run(execute_benchmark(base_url, num_requests, concurrent, first_id, _shard_barrier, verbose))
+
+
+async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int = 10, processes: int = 1):
+    """Run benchmark tests for a single server"""
+    server_name = SERVER_NAMES.get(base_url, base_url)
+    processes = max(1, min(processes, concurrent))
+    
+    print(f"\n{'='*70}")
+    print(f"API Performance Benchmark - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {base_url}")
+    print(f"Total Requests per Operation: {num_requests}")
+    print(f"Concurrent Requests: {concurrent}")
+    if processes > 1:
+        print(f"Load Generator Processes: {processes}")
+    print(f"{'='*70}\n")
+
+    if processes > 1:
+        request_shares = split_evenly(num_requests, processes)
+        shard_args = [
+            (base_url, share, shard_concurrent, 1 + sum(request_shares[:i]), i == 0)
+            for i, (share, shard_concurrent) in enumerate(zip(request_shares, split_evenly(concurrent, processes)))
+        ]
+        shard_results = await run_sharded(_benchmark_shard, shard_args)
+        # Phases start together on every shard, so a phase lasts as long as its slowest shard
+        all_results = {
+            operation: (
+                combine(shard[operation][0] for shard in shard_results),
+                max(shard[operation][1] for shard in shard_results),
+            )
+            for operation in shard_results[0]
+        }
+    else:
+        all_results = await execute_benchmark(base_url, num_requests, concurrent)
+
     # Print statistics
     print(f"\n{'='*70}")
     print(f"Results - {server_name}")
@@ -210,38 +593,27 @@ async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int
     operation_stats = {}
     total_wall_time = 0
     
-    for operation, (results, wall_time) in all_results.items():
+    for operation, (recorder, wall_time) in all_results.items():
         total_wall_time += wall_time
-        successful_results = [r for r in results if r["success"]]
         
-        if not successful_results:
+        if not recorder.successful:
             print(f"{operation}:")
             print(f"  ❌ All requests failed!")
             print()
             continue
-            
-        durations = [r["duration"] * 1000 for r in successful_results]  # Convert to ms
         
         # Calculate requests/sec using wall-clock time
-        req_per_sec = len(successful_results) / wall_time if wall_time > 0 else 0
-        
-        # Calculate percentiles
-        p95 = calculate_percentile(durations, 95)
-        p99 = calculate_percentile(durations, 99)
+        req_per_sec = recorder.successful / wall_time if wall_time > 0 else 0
         
         stats = {
-            "total": len(results),
-            "successful": len(successful_results),
-            "failed": len(results) - len(successful_results),
-            "mean": statistics.mean(durations),
-            "median": statistics.median(durations),
-            "min": min(durations),
-            "max": max(durations),
-            "p95": p95,
-            "p99": p99,
-            "stdev": statistics.stdev(durations) if len(durations) > 1 else 0,
+            "total": recorder.total,
+            "successful": recorder.successful,
+            "failed": recorder.failed,
+            **recorder.histogram.summary(),
             "req_per_sec": req_per_sec,
-            "wall_time": wall_time
+            "bytes_received": recorder.bytes_received,
+            "wall_time": wall_time,
+            "histogram": recorder.histogram
         }
         
         operation_stats[operation] = stats
@@ -252,6 +624,7 @@ async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int
         print(f"  Failed:            {stats['failed']}")
         print(f"  Wall Time:         {stats['wall_time']:.3f} s")
         print(f"  Requests/sec:      {stats['req_per_sec']:.2f}")
+        print(f"  Bytes Received:    {stats['bytes_received']} ({BODY_POLICY[operation]})")
         print(f"  Mean Duration:     {stats['mean']:.2f} ms")
         print(f"  Median Duration:   {stats['median']:.2f} ms")
         print(f"  Min Duration:      {stats['min']:.2f} ms")
@@ -262,8 +635,9 @@ async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int
         print()
 
     # Overall statistics
-    total_requests = sum(len(results) for results, _ in all_results.values())
-    total_successful = sum(len([r for r in results if r["success"]]) for results, _ in all_results.values())
+    overall = combine(recorder for recorder, _ in all_results.values())
+    total_requests = overall.total
+    total_successful = overall.successful
 
     if total_successful > 0:
         print(f"{'='*70}")
@@ -274,43 +648,43 @@ async def run_benchmark(base_url: str, num_requests: int = 100, concurrent: int
         print(f"Failed Requests:       {total_requests - total_successful}")
         print(f"Total Wall Time:       {total_wall_time:.3f} s")
         print(f"Overall Throughput:    {total_successful / total_wall_time:.2f} req/sec")
-        
-        # Calculate average duration across all successful requests
-        all_durations = []
-        for results, _ in all_results.values():
-            all_durations.extend([r["duration"] * 1000 for r in results if r["success"]])
-        
-        if all_durations:
-            overall_p95 = calculate_percentile(all_durations, 95)
-            overall_p99 = calculate_percentile(all_durations, 99)
-            print(f"Average Duration:      {statistics.mean(all_durations):.2f} ms")
-            print(f"Overall P95:           {overall_p95:.2f} ms")
-            print(f"Overall P99:           {overall_p99:.2f} ms")
+        print(f"Average Duration:      {overall.histogram.mean:.2f} ms")
+        print(f"Overall P95:           {overall.histogram.percentile(95):.2f} ms")
+        print(f"Overall P99:           {overall.histogram.percentile(99):.2f} ms")
         print(f"{'='*70}\n")
 
     return operation_stats
 
 
-async def stress_test(base_url: str, duration_seconds: int = 10, concurrent: int = 50):
-    """Stress test with continuous requests"""
-    server_name = SERVER_NAMES.get(base_url, base_url)
-    
-    print(f"\n{'='*70}")
-    print(f"Stress Test - {server_name}")
-    print(f"{'='*70}")
-    print(f"Target: {base_url}")
-    print(f"Duration: {duration_seconds} seconds")
-    print(f"Concurrent Workers: {concurrent}")
-    print(f"{'='*70}\n")
+async def execute_stress(base_url: str, duration_seconds: int, concurrent: int, first_id: int = 0,
+                         barrier=None, warmup_seconds: float = 0, interval_seconds: float = 1.0,
+                         on_interval=None, on_start=None) -> tuple:
+    """Run closed-loop CRUD workers for the warm-up plus the given duration.
 
+    Returns (recorders, series, measured_time). Requests started during the
+    warm-up only appear in the interval series, not in the recorders.
+    on_start is called as the workers start, before the warm-up.
+    """
+    wait_for_shards(barrier)
     start_time = time.perf_counter()
+    if on_start:
+        on_start()
+    measure_start = start_time + warmup_seconds
+    end_time = measure_start + duration_seconds
     id_lock = asyncio.Lock()
-    current_id = 0
-    results = []
+    current_id = first_id
+    recorders = {}
+    series = IntervalSeries(start_time, interval_seconds)
+
+    def record(result: Dict):
+        now = time.perf_counter()
+        series.record(result, now)
+        if now - result["duration"] >= measure_start:
+            record_result(recorders, result)
 
     async def worker(session: aiohttp.ClientSession):
         nonlocal current_id
-        while time.perf_counter() - start_time < duration_seconds:
+        while time.perf_counter() < end_time:
             # Get unique ID
             async with id_lock:
                 current_id += 1
@@ -318,51 +692,104 @@ async def stress_test(base_url: str, duration_seconds: int = 10, concurrent: int
             
             # Perform a mix of operations
             result = await create_user(session, base_url, worker_id)
-            results.append(result)
+            record(result)
 
             if result["success"]:
                 user_id = result["data"]["id"]
                 
                 result = await get_user(session, base_url, user_id)
-                results.append(result)
+                record(result)
                 
                 result = await update_user(session, base_url, user_id)
-                results.append(result)
+                record(result)
                 
                 result = await delete_user(session, base_url, user_id)
-                results.append(result)
+                record(result)
 
-    async with aiohttp.ClientSession() as session:
+    async with create_session(concurrent) as session:
+        reporter = asyncio.create_task(report_intervals(series, on_interval)) if on_interval else None
         workers = [worker(session) for _ in range(concurrent)]
         await asyncio.gather(*workers)
+        if reporter:
+            await stop_reporter(reporter)
+
+    return recorders, series, time.perf_counter() - measure_start
+
+
+def _stress_shard(base_url: str, duration_seconds: int, concurrent: int, first_id: int,
+                  warmup_seconds: float, interval_seconds: float) -> tuple:
+    try:
+        return asyncio.run(run_monitored(lambda started: execute_stress(
+            base_url, duration_seconds, concurrent, first_id, _shard_barrier,
+            warmup_seconds, interval_seconds, _send_interval, started
+        )))
+    finally:
+        _shard_intervals.put(None)
+
+
+async def stress_test(base_url: str, duration_seconds: int = 10, concurrent: int = 50, processes: int = 1,
+                      warmup_seconds: float = 0, interval_seconds: float = 1.0, on_start=None):
+    """Stress test with continuous requests; on_start is called as the load generators start"""
+    server_name = SERVER_NAMES.get(base_url, base_url)
+    processes = max(1, min(processes, concurrent))
+    
+    print(f"\n{'='*70}")
+    print(f"Stress Test - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {base_url}")
+    print(f"Duration: {duration_seconds} seconds")
+    if warmup_seconds:
+        print(f"Warm-up: {warmup_seconds:g} seconds (excluded from results)")
+    print(f"Concurrent Workers: {concurrent}")
+    if processes > 1:
+        print(f"Load Generator Processes: {processes}")
+    print(f"{'='*70}\n")
+
+    def on_interval(index: int, recorders: Dict[str, OperationRecorder]):
+        print_interval(index, recorders, interval_seconds, warmup_seconds)
+
+    print(f"Live intervals (p50/p99 ms per operation):")
+    if processes > 1:
+        # Space the shards' user IDs far apart so names never collide
+        shard_args = [
+            (base_url, duration_seconds, shard_concurrent, i * 100_000_000, warmup_seconds, interval_seconds)
+            for i, shard_concurrent in enumerate(split_evenly(concurrent, processes))
+        ]
+        shard_results, client_summaries = zip(*await run_sharded(_stress_shard, shard_args, on_interval, on_start))
+        recorders = merge_recorders(*(shard[0] for shard in shard_results))
+        series = IntervalSeries(0, interval_seconds)
+        for shard in shard_results:
+            series.merge(shard[1])
+        total_time = max(shard[2] for shard in shard_results)
+    else:
+        (recorders, series, total_time), client = await run_monitored(lambda started: execute_stress(
+            base_url, duration_seconds, concurrent,
+            warmup_seconds=warmup_seconds, interval_seconds=interval_seconds, on_interval=on_interval,
+            on_start=started
+        ), on_start)
+        client_summaries = [client]
+    print()
 
     # Calculate statistics
-    successful_results = [r for r in results if r["success"]]
+    overall = combine(recorders.values())
     
-    if not successful_results:
+    if not overall.successful:
         print("❌ All stress test requests failed!")
         return None
-        
-    durations = [r["duration"] * 1000 for r in successful_results]
-    total_time = time.perf_counter() - start_time
-    
-    # Calculate percentiles
-    p95 = calculate_percentile(durations, 95)
-    p99 = calculate_percentile(durations, 99)
 
     stats = {
-        "total": len(results),
-        "successful": len(successful_results),
-        "failed": len(results) - len(successful_results),
+        "total": overall.total,
+        "successful": overall.successful,
+        "failed": overall.failed,
         "total_time": total_time,
-        "req_per_sec": len(successful_results) / total_time,
-        "mean": statistics.mean(durations),
-        "median": statistics.median(durations),
-        "min": min(durations),
-        "max": max(durations),
-        "p95": p95,
-        "p99": p99,
-        "stdev": statistics.stdev(durations) if len(durations) > 1 else 0
+        "req_per_sec": overall.successful / total_time,
+        "bytes_received": overall.bytes_received,
+        **overall.histogram.summary(),
+        "warmup_seconds": warmup_seconds,
+        "time_series": series.to_list(),
+        "client": combine_client_stats(client_summaries),
+        "phases": overall.phase_summary(),
+        "histogram": overall.histogram
     }
 
     print(f"Stress Test Results:")
@@ -371,6 +798,7 @@ async def stress_test(base_url: str, duration_seconds: int = 10, concurrent: int
     print(f"  Failed:            {stats['failed']}")
     print(f"  Total Time:        {stats['total_time']:.2f} seconds")
     print(f"  Requests/sec:      {stats['req_per_sec']:.2f}")
+    print(f"  Bytes Received:    {stats['bytes_received']}")
     print(f"  Mean Duration:     {stats['mean']:.2f} ms")
     print(f"  Median Duration:   {stats['median']:.2f} ms")
     print(f"  Min Duration:      {stats['min']:.2f} ms")
@@ -383,108 +811,1899 @@ async def stress_test(base_url: str, duration_seconds: int = 10, concurrent: int
     return stats
 
 
-async def compare_servers(benchmark_results: Dict, stress_results: Dict):
-    """Compare results from multiple servers"""
+async def prepopulate_users(base_url: str, count: int, first_id: int = 1, concurrent: int = 100) -> List[int]:
+    """Create users before a workload runs and return their IDs in creation order"""
+    created_ids = []
+    async with create_session(concurrent) as session:
+        await run_with_workers(
+            create_user, [(session, base_url, first_id + i) for i in range(count)], concurrent,
+            OperationRecorder(), on_success=lambda result: created_ids.append(result["data"]["id"])
+        )
+    return created_ids
+
+
+async def execute_workload(base_url: str, workload: Workload, duration_seconds: int, concurrent: int,
+                           user_ids: List[int], first_id: int = 0, barrier=None, warmup_seconds: float = 0,
+                           interval_seconds: float = 1.0, on_interval=None, on_start=None) -> tuple:
+    """Run closed-loop workers that each pick their next operation and user from the workload spec.
+
+    Returns (recorders, series, measured_time), like execute_stress. Users
+    created during the run join the key space; deleted users leave it.
+    """
+    wait_for_shards(barrier)
+    start_time = time.perf_counter()
+    if on_start:
+        on_start()
+    measure_start = start_time + warmup_seconds
+    end_time = measure_start + duration_seconds
+    rng = random.Random()
+    keys = workload.key_space(user_ids, rng)
+    think_time = workload.think_time_ms / 1000
+    current_id = first_id
+    recorders = {}
+    series = IntervalSeries(start_time, interval_seconds)
+
+    def record(result: Dict):
+        now = time.perf_counter()
+        series.record(result, now)
+        if now - result["duration"] >= measure_start:
+            record_result(recorders, result)
+
+    async def issue(session: aiohttp.ClientSession, operation: str) -> Dict:
+        nonlocal current_id
+        if operation in KEYED_OPERATIONS and not keys:
+            # Nothing left to act on, so grow the key space instead
+            operation = "CREATE"
+        if operation == "CREATE":
+            current_id += 1
+            result = await create_user(session, base_url, current_id)
+            if result["success"]:
+                keys.add(result["data"]["id"])
+            return result
+        if operation == "GET_ALL":
+            return await get_all_users(session, base_url)
+        if operation == "DELETE":
+            return await delete_user(session, base_url, keys.take())
+        request_fn = get_user if operation == "GET_ONE" else update_user
+        return await request_fn(session, base_url, keys.choose())
+
+    async def worker(session: aiohttp.ClientSession):
+        while time.perf_counter() < end_time:
+            record(await issue(session, workload.choose_operation(rng)))
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    async with create_session(concurrent) as session:
+        reporter = asyncio.create_task(report_intervals(series, on_interval)) if on_interval else None
+        await asyncio.gather(*(worker(session) for _ in range(concurrent)))
+        if reporter:
+            await stop_reporter(reporter)
+
+    return recorders, series, time.perf_counter() - measure_start
+
+
+def _workload_shard(base_url: str, workload: Workload, duration_seconds: int, concurrent: int,
+                    user_ids: List[int], first_id: int, warmup_seconds: float, interval_seconds: float) -> tuple:
+    try:
+        return asyncio.run(run_monitored(lambda started: execute_workload(
+            base_url, workload, duration_seconds, concurrent, user_ids, first_id, _shard_barrier,
+            warmup_seconds, interval_seconds, _send_interval, started
+        )))
+    finally:
+        _shard_intervals.put(None)
+
+
+async def workload_test(base_url: str, workload: Workload, duration_seconds: int = 10, concurrent: int = 50,
+                        processes: int = 1, warmup_seconds: float = 0, interval_seconds: float = 1.0,
+                        on_start=None):
+    """Stress test driven by a declarative workload instead of the fixed create/get/update/delete loop"""
+    server_name = SERVER_NAMES.get(base_url, base_url)
+    processes = max(1, min(processes, concurrent))
+
+    print(f"\n{'='*70}")
+    print(f"Workload Test - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {base_url}")
+    print(f"Workload: {workload.describe()}")
+    print(f"Duration: {duration_seconds} seconds")
+    if warmup_seconds:
+        print(f"Warm-up: {warmup_seconds:g} seconds (excluded from results)")
+    print(f"Concurrent Workers: {concurrent}")
+    if processes > 1:
+        print(f"Load Generator Processes: {processes}")
+    print(f"{'='*70}\n")
+
+    user_ids = []
+    if workload.prepopulate:
+        print(f"Pre-populating {workload.prepopulate} users...")
+        user_ids = await prepopulate_users(base_url, workload.prepopulate)
+        if len(user_ids) < workload.prepopulate:
+            print(f"  ⚠ Only {len(user_ids)} of {workload.prepopulate} users were created")
+
+    def on_interval(index: int, recorders: Dict[str, OperationRecorder]):
+        print_interval(index, recorders, interval_seconds, warmup_seconds)
+
+    print(f"Live intervals (p50/p99 ms per operation):")
+    if processes > 1:
+        # Each shard owns an interleaved slice of the users, so popularity ranks are
+        # preserved and no two shards delete the same user
+        shard_args = [
+            (base_url, workload, duration_seconds, shard_concurrent, user_ids[i::processes],
+             (i + 1) * 100_000_000, warmup_seconds, interval_seconds)
+            for i, shard_concurrent in enumerate(split_evenly(concurrent, processes))
+        ]
+        shard_results, client_summaries = zip(*await run_sharded(_workload_shard, shard_args, on_interval, on_start))
+        recorders = merge_recorders(*(shard[0] for shard in shard_results))
+        series = IntervalSeries(0, interval_seconds)
+        for shard in shard_results:
+            series.merge(shard[1])
+        total_time = max(shard[2] for shard in shard_results)
+    else:
+        (recorders, series, total_time), client = await run_monitored(lambda started: execute_workload(
+            base_url, workload, duration_seconds, concurrent, user_ids, 100_000_000,
+            warmup_seconds=warmup_seconds, interval_seconds=interval_seconds, on_interval=on_interval,
+            on_start=started
+        ), on_start)
+        client_summaries = [client]
+    print()
+
+    overall = combine(recorders.values())
+
+    if not overall.successful:
+        print("❌ All workload requests failed!")
+        return None
+
+    stats = {
+        "total": overall.total,
+        "successful": overall.successful,
+        "failed": overall.failed,
+        "total_time": total_time,
+        "req_per_sec": overall.successful / total_time,
+        "bytes_received": overall.bytes_received,
+        **overall.histogram.summary(),
+        "warmup_seconds": warmup_seconds,
+        "workload": workload.to_dict(),
+        "time_series": series.to_list(),
+        "client": combine_client_stats(client_summaries),
+        "phases": overall.phase_summary(),
+        "histogram": overall.histogram,
+        "operations": {}
+    }
+
+    for operation in OPERATIONS:
+        recorder = recorders.get(operation)
+        if recorder and recorder.total:
+            stats["operations"][operation] = {
+                "total": recorder.total,
+                "successful": recorder.successful,
+                "req_per_sec": recorder.successful / total_time,
+                **recorder.histogram.summary(),
+            }
+
+    print(f"Workload Test Results:")
+    print(f"  Total Requests:    {stats['total']}")
+    print(f"  Successful:        {stats['successful']}")
+    print(f"  Failed:            {stats['failed']}")
+    print(f"  Total Time:        {stats['total_time']:.2f} seconds")
+    print(f"  Requests/sec:      {stats['req_per_sec']:.2f}")
+    print(f"  Bytes Received:    {stats['bytes_received']}")
+    print(f"  Mean Duration:     {stats['mean']:.2f} ms")
+    print(f"  Median Duration:   {stats['median']:.2f} ms")
+    print(f"  P95:               {stats['p95']:.2f} ms")
+    print(f"  P99:               {stats['p99']:.2f} ms")
+    print()
+    print(f"  {'Operation':<12} {'Share':<8} {'Req/sec':<12} {'Failed':<8} {'Mean':<10} {'Median':<10} {'P95':<10} {'P99':<10}")
+    print(f"  {'-'*80}")
+    for operation, op_stats in stats["operations"].items():
+        share = op_stats["total"] / stats["total"] * 100
+        print(f"  {operation:<12} {f'{share:.1f}%':<8} {op_stats['req_per_sec']:<12.2f} {op_stats['total'] - op_stats['successful']:<8} "
+              f"{op_stats['mean']:<10.2f} {op_stats['median']:<10.2f} {op_stats['p95']:<10.2f} {op_stats['p99']:<10.2f}")
+    print(f"{'='*70}\n")
+
+    return stats
+
+
+async def execute_open_loop(base_url: str, rate: float, duration_seconds: int, arrival: str,
+                            max_in_flight: int, late_threshold_ms: float, first_id: int = 0, barrier=None,
+                            warmup_seconds: float = 0, interval_seconds: float = 1.0, on_interval=None,
+                            on_start=None) -> tuple:
+    """Issue requests on a fixed schedule for the warm-up plus the given duration.
+
+    Returns (recorders, service_recorders, series, counters, measured_time).
+    Arrivals scheduled during the warm-up only appear in the interval series.
+    """
+    recorders = {}
+    service_recorders = {}
+    live_ids = deque()
+    in_flight = set()
+    counters = {"scheduled": 0, "dropped": 0, "late": 0}
+    series = None
+
+    async def fire(session: aiohttp.ClientSession, sequence: int, intended: float):
+        operation = OPEN_LOOP_SEQUENCE[sequence % len(OPEN_LOOP_SEQUENCE)]
+        if operation == "DELETE" and live_ids:
+            result = await delete_user(session, base_url, live_ids.popleft())
+        elif operation == "GET_ONE" and live_ids:
+            result = await get_user(session, base_url, random.choice(live_ids))
+        elif operation == "UPDATE" and live_ids:
+            result = await update_user(session, base_url, random.choice(live_ids))
+        else:
+            result = await create_user(session, base_url, first_id + sequence + 1)
+            if result["success"] and result["status"] == 201:
+                live_ids.append(result["data"]["id"])
+
+        measured = intended >= start_time + warmup_seconds
+        if measured:
+            record_result(service_recorders, result)
+        # Charge the request with any time it spent waiting to be sent
+        now = time.perf_counter()
+        result["duration"] = now - intended
+        series.record(result, now)
+        if measured:
+            record_result(recorders, result)
+
+    async with create_session(max_in_flight) as session:
+        wait_for_shards(barrier)
+        start_time = time.perf_counter()
+        if on_start:
+            on_start()
+        series = IntervalSeries(start_time, interval_seconds)
+        reporter = asyncio.create_task(report_intervals(series, on_interval)) if on_interval else None
+        next_offset = 0.0
+        sequence = 0
+
+        while next_offset < warmup_seconds + duration_seconds:
+            delay = next_offset - (time.perf_counter() - start_time)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Behind schedule: still let in-flight requests finish between overdue sends,
+                # rather than firing the whole backlog as one burst
+                await asyncio.sleep(0)
+
+            intended = start_time + next_offset
+            measured = next_offset >= warmup_seconds
+            if measured and (time.perf_counter() - intended) * 1000 > late_threshold_ms:
+                counters["late"] += 1
+
+            if len(in_flight) >= max_in_flight:
+                if measured:
+                    counters["dropped"] += 1
+            else:
+                task = asyncio.create_task(fire(session, sequence, intended))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if measured:
+                counters["scheduled"] += 1
+            sequence += 1
+
+            if arrival == "poisson":
+                next_offset += random.expovariate(rate)
+            else:
+                next_offset += 1 / rate
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        if reporter:
+            await stop_reporter(reporter)
+        total_time = time.perf_counter() - start_time - warmup_seconds
+
+    return recorders, service_recorders, series, counters, total_time
+
+
+def _open_loop_shard(base_url: str, rate: float, duration_seconds: int, arrival: str, max_in_flight: int,
+                     late_threshold_ms: float, first_id: int, warmup_seconds: float, interval_seconds: float) -> tuple:
+    try:
+        return asyncio.run(run_monitored(lambda started: execute_open_loop(
+            base_url, rate, duration_seconds, arrival, max_in_flight, late_threshold_ms, first_id, _shard_barrier,
+            warmup_seconds, interval_seconds, _send_interval, started
+        )))
+    finally:
+        _shard_intervals.put(None)
+
+
+async def open_loop_test(base_url: str, rate: float = 1000, duration_seconds: int = 10, arrival: str = "uniform",
+                         max_in_flight: int = 1000, late_threshold_ms: float = 10.0, processes: int = 1,
+                         warmup_seconds: float = 0, interval_seconds: float = 1.0, on_start=None):
+    """Open-loop test issuing requests on a fixed schedule, independent of response times.
+
+    Latency is measured from each request's intended send time, so time spent
+    queued behind a stalled server counts against it (coordinated omission correction).
+    """
+    server_name = SERVER_NAMES.get(base_url, base_url)
+    # Every shard needs room for at least one request in flight
+    processes = max(1, min(processes, max_in_flight))
+
+    print(f"\n{'='*70}")
+    print(f"Open-Loop Test - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {base_url}")
+    print(f"Duration: {duration_seconds} seconds")
+    if warmup_seconds:
+        print(f"Warm-up: {warmup_seconds:g} seconds (excluded from results)")
+    print(f"Target Rate: {rate:.0f} req/sec ({arrival} arrivals)")
+    print(f"Max In-Flight: {max_in_flight}")
+    if processes > 1:
+        print(f"Load Generator Processes: {processes}")
+    print(f"{'='*70}\n")
+
+    def on_interval(index: int, recorders: Dict[str, OperationRecorder]):
+        print_interval(index, recorders, interval_seconds, warmup_seconds)
+
+    print(f"Live intervals (p50/p99 ms per operation):")
+    if processes > 1:
+        # Each shard runs its own schedule at an equal share of the target rate
+        shard_args = [
+            (base_url, rate / processes, duration_seconds, arrival, shard_in_flight, late_threshold_ms,
+             i * 100_000_000, warmup_seconds, interval_seconds)
+            for i, shard_in_flight in enumerate(split_evenly(max_in_flight, processes))
+        ]
+        shard_results, client_summaries = zip(*await run_sharded(_open_loop_shard, shard_args, on_interval, on_start))
+        recorders = merge_recorders(*(shard[0] for shard in shard_results))
+        service_recorders = merge_recorders(*(shard[1] for shard in shard_results))
+        series = IntervalSeries(0, interval_seconds)
+        for shard in shard_results:
+            series.merge(shard[2])
+        counters = {key: sum(shard[3][key] for shard in shard_results) for key in shard_results[0][3]}
+        total_time = max(shard[4] for shard in shard_results)
+    else:
+        (recorders, service_recorders, series, counters, total_time), client = await run_monitored(lambda started: execute_open_loop(
+            base_url, rate, duration_seconds, arrival, max_in_flight, late_threshold_ms,
+            warmup_seconds=warmup_seconds, interval_seconds=interval_seconds, on_interval=on_interval,
+            on_start=started
+        ), on_start)
+        client_summaries = [client]
+    print()
+
+    overall = combine(recorders.values())
+
+    if not overall.successful:
+        print("❌ All open-loop requests failed!")
+        return None
+
+    stats = {
+        "total": overall.total,
+        "successful": overall.successful,
+        "failed": overall.failed,
+        "total_time": total_time,
+        "target_rate": rate,
+        **counters,
+        "dropped_percent": counters["dropped"] / counters["scheduled"] * 100 if counters["scheduled"] else 0,
+        "req_per_sec": overall.successful / total_time,
+        "bytes_received": overall.bytes_received,
+        **overall.histogram.summary(),
+        "service_p99": combine(service_recorders.values()).histogram.percentile(99),
+        "warmup_seconds": warmup_seconds,
+        "time_series": series.to_list(),
+        "client": combine_client_stats(client_summaries),
+        "phases": overall.phase_summary(),
+        "histogram": overall.histogram,
+        "operations": {}
+    }
+
+    for operation in OPEN_LOOP_SEQUENCE:
+        recorder = recorders.get(operation)
+        if recorder and recorder.successful:
+            stats["operations"][operation] = {"successful": recorder.successful, **recorder.histogram.summary()}
+
+    print(f"Open-Loop Test Results:")
+    print(f"  Scheduled:         {stats['scheduled']}")
+    print(f"  Dropped:           {stats['dropped']} ({stats['dropped_percent']:.2f}% of scheduled)")
+    print(f"  {f'Late (>{late_threshold_ms:g} ms):':<19}{stats['late']}")
+    print(f"  Total Requests:    {stats['total']}")
+    print(f"  Successful:        {stats['successful']}")
+    print(f"  Failed:            {stats['failed']}")
+    print(f"  Total Time:        {stats['total_time']:.2f} seconds")
+    print(f"  Target Rate:       {stats['target_rate']:.2f} req/sec")
+    print(f"  Achieved Rate:     {stats['req_per_sec']:.2f} req/sec")
+    print(f"  Bytes Received:    {stats['bytes_received']}")
+    print(f"  Mean Latency:      {stats['mean']:.2f} ms")
+    print(f"  Median Latency:    {stats['median']:.2f} ms")
+    print(f"  P95:               {stats['p95']:.2f} ms")
+    print(f"  P99:               {stats['p99']:.2f} ms ({stats['dropped_percent']:.2f}% dropped)")
+    print(f"  P99 (service):     {stats['service_p99']:.2f} ms")
+    if stats["dropped"]:
+        print(f"  ⚠ Dropped arrivals add no latency, so these percentiles understate how the server coped "
+              f"with the offered load")
+    print()
+    print(f"  {'Operation':<12} {'Count':<10} {'Mean':<10} {'Median':<10} {'P95':<10} {'P99':<10}")
+    print(f"  {'-'*62}")
+    for operation, op_stats in stats["operations"].items():
+        print(f"  {operation:<12} {op_stats['successful']:<10} {op_stats['mean']:<10.2f} {op_stats['median']:<10.2f} {op_stats['p95']:<10.2f} {op_stats['p99']:<10.2f}")
+    print(f"{'='*70}\n")
+
+    return stats
+
+
+def print_winner(label: str, candidates: List[tuple], higher_is_better: bool, alpha: float):
+    """Name the best of (server name, mean, stdev, sample count) candidates only if it beats every other significantly.
+
+    Each rival is compared with the leader using Welch's t-test; when any
+    p-value is at or above alpha (or there are too few samples to test), the
+    closest rival is shown instead of a winner.
+    """
+    if not candidates:
+        return
+    ranked = sorted(candidates, key=lambda candidate: candidate[1], reverse=higher_is_better)
+    best = ranked[0]
+    if len(ranked) == 1:
+        print(f"  🏆 Winner ({label}): {best[0]}")
+        return
+
+    closest, closest_p = None, -1.0
+    for rival in ranked[1:]:
+        test = welch_t_test(best[1], best[2], best[3], rival[1], rival[2], rival[3])
+        if not test:
+            print(f"  ≈ No significant winner ({label}): {best[0]} vs {rival[0]}, too few samples to test")
+            return
+        if test[2] > closest_p:
+            closest, closest_p = rival, test[2]
+    if closest_p < alpha:
+        print(f"  🏆 Winner ({label}): {best[0]} (p = {closest_p:.3g} vs {closest[0]})")
+    else:
+        print(f"  ≈ No significant winner ({label}): {best[0]} vs {closest[0]}, p = {closest_p:.3g}")
+
+
+def interval_throughputs(stats: Dict) -> List[float]:
+    """Throughput of each measured stress interval, leaving out the warm-up and the last, usually partial, interval"""
+    warmup = stats.get("warmup_seconds", 0)
+    return [entry["req_per_sec"] for entry in stats.get("time_series", [])[:-1] if entry["t"] >= warmup]
+
+
+def throughput_candidate(server_name: str, stats: Dict) -> tuple:
+    """A print_winner candidate for a stress result, tested on its per-interval throughput.
+
+    The mean is taken over the same intervals as the deviation, so two servers
+    whose every interval hit the same open-loop rate are not told apart by
+    the partial last interval.
+    """
+    samples = interval_throughputs(stats)
+    return server_name, mean(samples) if samples else stats["req_per_sec"], stdev(samples), len(samples)
+
+
+async def compare_servers(benchmark_results: Dict, stress_results: Dict, server_results: Optional[Dict] = None,
+                          alpha: float = 0.05):
+    """Compare results from multiple servers.
+
+    Winners are only declared when they are significantly better at alpha:
+    benchmark operations are tested on per-request latencies, the stress phase
+    on per-interval throughput.
+    """
     print(f"\n{'='*70}")
     print("COMPARISON SUMMARY")
     print(f"{'='*70}\n")
     
     # Benchmark comparison
-    print("Benchmark Results Comparison:")
-    print(f"{'='*70}")
-    
-    operations = ["CREATE", "GET_ALL", "GET_ONE", "UPDATE", "DELETE"]
-    
-    for operation in operations:
-        print(f"\n{operation}:")
-        print(f"  {'Server':<25} {'Req/sec':<12} {'Mean':<10} {'Median':<10} {'P95':<10} {'P99':<10}")
-        print(f"  {'-'*75}")
+    if benchmark_results:
+        print("Benchmark Results Comparison:")
+        print(f"{'='*70}")
+        print("  Single run: winners are tested against this run's request-to-request noise only, so small gaps")
+        print("  look significant; use --runs to test against run-to-run noise.")
+        for operation in OPERATIONS:
+            print(f"\n{operation}:")
+            print(f"  {'Server':<25} {'Req/sec':<12} {'Mean':<10} {'Median':<10} {'P95':<10} {'P99':<10}")
+            print(f"  {'-'*75}")
         
-        best_mean = float('inf')
-        best_server = None
+            candidates = []
         
-        for url in URLS:
-            if url in benchmark_results and operation in benchmark_results[url]:
-                stats = benchmark_results[url][operation]
-                server_name = SERVER_NAMES.get(url, url)
-                print(f"  {server_name:<25} {stats['req_per_sec']:<12.2f} {stats['mean']:<10.2f} {stats['median']:<10.2f} {stats['p95']:<10.2f} {stats['p99']:<10.2f}")
-                
-                if stats['mean'] < best_mean:
-                    best_mean = stats['mean']
-                    best_server = server_name
+            for url in ALL_URLS:
+                if url in benchmark_results and operation in (benchmark_results[url] or {}):
+                    stats = benchmark_results[url][operation]
+                    server_name = SERVER_NAMES.get(url, url)
+                    print(f"  {server_name:<25} {stats['req_per_sec']:<12.2f} {stats['mean']:<10.2f} {stats['median']:<10.2f} {stats['p95']:<10.2f} {stats['p99']:<10.2f}")
+                    candidates.append((server_name, stats['mean'], stats['stdev'], stats['successful']))
         
-        if best_server:
-            print(f"  🏆 Winner (Best Mean): {best_server}")
+            print_winner("Best Mean", candidates, higher_is_better=False, alpha=alpha)
     
     # Stress test comparison
     if stress_results:
         print(f"\n\nStress Test Comparison:")
         print(f"{'='*70}")
-        print(f"  {'Server':<25} {'Req/sec':<12} {'Mean':<10} {'Median':<10} {'P95':<10} {'P99':<10} {'Success':<10}")
-        print(f"  {'-'*85}")
+        print(f"  {'Server':<25} {'Req/sec':<12} {'Mean':<10} {'Median':<10} {'P95':<10} {'P99':<10} {'Success':<10} "
+              f"{'Req/CPU-s':<12} {'Peak MB':<10} {'Steady MB':<10}")
+        print(f"  {'-'*118}")
         
-        best_throughput = 0
-        best_server = None
+        candidates = []
+        client_bound = False
+        dropped = False
         
-        for url in URLS:
+        for url in ALL_URLS:
             if url in stress_results and stress_results[url]:
                 stats = stress_results[url]
                 server_name = SERVER_NAMES.get(url, url)
                 success_rate = (stats['successful'] / stats['total']) * 100 if stats['total'] > 0 else 0
-                print(f"  {server_name:<25} {stats['req_per_sec']:<12.2f} {stats['mean']:<10.2f} {stats['median']:<10.2f} {stats['p95']:<10.2f} {stats['p99']:<10.2f} {success_rate:<10.1f}%")
+                # Resource columns are blank when the server's process could not be sampled
+                resources = stats.get("resources")
+                efficiency = f"{stats['req_per_cpu_sec']:<12.2f} {resources['rss_peak_mb']:<10.1f} {resources['rss_steady_mb']:<10.1f}" if resources else f"{'-':<12} {'-':<10} {'-':<10}"
+                label = server_name
+                if stats.get("client_bound"):
+                    label += " *"
+                    client_bound = True
+                if stats.get("dropped"):
+                    label += " †"
+                    dropped = True
+                print(f"  {label:<25} {stats['req_per_sec']:<12.2f} {stats['mean']:<10.2f} {stats['median']:<10.2f} {stats['p95']:<10.2f} {stats['p99']:<10.2f} {f'{success_rate:.1f}%':<10} {efficiency}")
                 
-                if stats['req_per_sec'] > best_throughput:
-                    best_throughput = stats['req_per_sec']
-                    best_server = server_name
+                candidates.append(throughput_candidate(server_name, stats))
         
-        if best_server:
-            print(f"  🏆 Winner (Best Throughput): {best_server}")
+        if client_bound:
+            print(f"\n  * Client-bound: the load generator saturated before the server, so this row understates it")
+        if dropped:
+            print(f"  † Open-loop arrivals were dropped at the in-flight cap; they add no latency, so the "
+                  f"percentiles look better than they are")
+        print_winner("Best Throughput", candidates, higher_is_better=True, alpha=alpha)
+
+    # Server process comparison (only for servers launched by the benchmark)
+    if server_results:
+        print(f"\n\nServer Process Comparison:")
+        print(f"{'='*70}")
+        print(f"  {'Server':<25} {'Startup ms':<12} {'Peak RSS MB':<13} {'Mean RSS MB':<13} {'CPU s':<10} {'CPU %':<10}")
+        print(f"  {'-'*83}")
+
+        for url in ALL_URLS:
+            if url in server_results and server_results[url]:
+                stats = server_results[url]
+                server_name = SERVER_NAMES.get(url, url)
+                print(f"  {server_name:<25} {stats['startup_ms']:<12.1f} {stats.get('rss_peak_mb', 0):<13.1f} {stats.get('rss_mean_mb', 0):<13.1f} {stats.get('cpu_seconds', 0):<10.2f} {stats.get('cpu_percent', 0):<10.1f}")
     
     print(f"\n{'='*70}\n")
 
 
-async def main():
+def print_resource_stats(url: str, stats: Dict):
+    resources = stats["resources"]
+    print(f"Server Resources During Stress - {SERVER_NAMES.get(url, url)}:")
+    print(f"  Peak RSS:          {resources['rss_peak_mb']:.1f} MB")
+    print(f"  Steady RSS:        {resources['rss_steady_mb']:.1f} MB")
+    print(f"  CPU Time:          {resources['cpu_seconds']:.2f} s ({resources['cpu_percent']:.1f}% of one core)")
+    print(f"  Req/CPU-second:    {stats['req_per_cpu_sec']:.2f}")
+    print(f"  Peak Threads:      {resources['threads_peak']}")
+    if resources["fds_peak"] is not None:
+        print(f"  Peak Open FDs:     {resources['fds_peak']}")
+    print(f"{'='*70}\n")
+
+
+def print_client_stats(url: str, stats: Dict):
+    client = stats["client"]
+    print(f"Load Generator During Stress - {SERVER_NAMES.get(url, url)}:")
+    print(f"  Processes:         {client['processes']}")
+    print(f"  CPU (busiest):     {client['cpu_percent_max']:.1f}% of one core")
+    print(f"  Event-loop Lag:    mean {client['lag_mean_ms']:.2f} ms, p99 {client['lag_p99_ms']:.2f} ms, "
+          f"max {client['lag_max_ms']:.2f} ms")
+    if stats["phases"]:
+        print(f"\n  {'Phase':<12} {'Mean':<10} {'Median':<10} {'P99':<10}")
+        print(f"  {'-'*42}")
+        for phase in PHASES:
+            timing = stats["phases"].get(phase)
+            if timing:
+                print(f"  {phase:<12} {timing['mean']:<10.2f} {timing['median']:<10.2f} {timing['p99']:<10.2f}")
+    if stats["client_bound"]:
+        print(f"\n  ⚠ Client-bound: {'; '.join(stats['client_bound_reasons'])}.")
+        print(f"    The figures above may measure the load generator rather than the server; "
+              f"try more --processes or --engine raw.")
+    print(f"{'='*70}\n")
+
+
+async def run_stress_phase(url: str, args: argparse.Namespace):
+    """Run the stress phase for one server with the load model chosen on the command line.
+
+    When the server's process can be found from its port, its resources are
+    sampled over the measured part of the phase: from the end of the warm-up,
+    timed from when the load generators start (after any shard spawning or
+    pre-population), to the end of the run. The load
+    generator's own CPU and event-loop lag are always measured, and the result
+    is marked client-bound when either crosses its threshold.
+    """
+    pid = find_server_pid(urlparse(url).port)
+    sampler = ProcessSampler(pid, args.sample_interval) if pid else None
+
+    timers = []
+
+    def sample_after_warmup():
+        timers.append(asyncio.get_running_loop().call_later(args.warmup, sampler.start))
+
+    on_start = sample_after_warmup if sampler else None
+    try:
+        if args.workload:
+            stats = await workload_test(
+                url, args.workload, duration_seconds=args.duration, concurrent=args.connections, processes=args.processes,
+                warmup_seconds=args.warmup, interval_seconds=args.interval, on_start=on_start
+            )
+        elif args.load_model == "open":
+            stats = await open_loop_test(
+                url, rate=args.rate, duration_seconds=args.duration,
+                arrival=args.arrival, max_in_flight=args.max_in_flight, late_threshold_ms=args.late_threshold,
+                processes=args.processes,
+                warmup_seconds=args.warmup, interval_seconds=args.interval, on_start=on_start
+            )
+        else:
+            stats = await stress_test(
+                url, duration_seconds=args.duration, concurrent=args.connections, processes=args.processes,
+                warmup_seconds=args.warmup, interval_seconds=args.interval, on_start=on_start
+            )
+    finally:
+        for timer in timers:
+            timer.cancel()
+    resources = await sampler.stop() if sampler else {}
+
+    if stats and resources:
+        stats["resources"] = resources
+        # The server is idle once the run ends, so its CPU time over the window is what the measured requests cost
+        cpu_seconds = resources["cpu_seconds"]
+        stats["req_per_cpu_sec"] = stats["successful"] / cpu_seconds if cpu_seconds else 0
+        print_resource_stats(url, stats)
+    if stats:
+        reasons = client_bottlenecks(stats["client"], args.max_client_cpu, args.max_loop_lag)
+        stats["client_bound"] = bool(reasons)
+        stats["client_bound_reasons"] = reasons
+        print_client_stats(url, stats)
+    return stats
+
+
+async def run_target(url: str, args: argparse.Namespace) -> tuple:
+    """Run the benchmark and stress phases against one server"""
+    benchmark_stats = await run_benchmark(url, num_requests=1000, concurrent=100, processes=args.processes)
+    stress_stats = await run_stress_phase(url, args)
+    return benchmark_stats, stress_stats
+
+
+# Metrics whose confidence intervals decide when a repeated target has converged
+REPEATED_METRICS = (("req_per_sec", "Req/sec", True), ("p99", "P99", False))
+
+
+def run_metrics(benchmark_stats: Optional[Dict], stress_stats: Optional[Dict]) -> Dict[tuple, Dict[str, float]]:
+    """Throughput and P99 of one run, keyed by (phase, operation)"""
+    metrics = {}
+    for operation, stats in (benchmark_stats or {}).items():
+        metrics[("benchmark", operation)] = {metric: stats[metric] for metric, _, _ in REPEATED_METRICS}
+    if stress_stats:
+        metrics[("stress", "ALL")] = {metric: stress_stats[metric] for metric, _, _ in REPEATED_METRICS}
+    return metrics
+
+
+def run_samples(runs: List[tuple]) -> Dict[tuple, Dict[str, List[float]]]:
+    """Per-run values of each metric, keyed by (phase, operation)"""
+    samples = {}
+    for benchmark_stats, stress_stats, _ in runs:
+        for key, metrics in run_metrics(benchmark_stats, stress_stats).items():
+            for metric, value in metrics.items():
+                samples.setdefault(key, {}).setdefault(metric, []).append(value)
+    return samples
+
+
+def converged(runs: List[tuple], args: argparse.Namespace) -> bool:
+    """Whether every metric's confidence interval is within --ci-width of its mean after at least --min-runs runs"""
+    if len(runs) < args.min_runs:
+        return False
+    samples = run_samples(runs)
+    for metrics in samples.values():
+        for values in metrics.values():
+            if len(values) < args.min_runs:
+                return False
+            average, half_width = confidence_interval(values, args.confidence)
+            if not average or half_width / abs(average) > args.ci_width:
+                return False
+    return bool(samples)
+
+
+async def run_repeated(urls: List[str], args: argparse.Namespace) -> Dict[str, List[tuple]]:
+    """Repeat the benchmark and stress phases until every server's results are precise enough.
+
+    Each repetition visits the servers that still need runs in a new random
+    order, so drift in the host (thermal throttling, background load) and
+    order effects do not consistently favour one server. A server stops being
+    repeated once it has converged; the loop ends when all have, after --runs
+    repetitions, or when --time-budget runs out.
+
+    Returns {url: [(benchmark_stats, stress_stats, server_stats), ...]}, one tuple per run.
+    """
+    runs = {url: [] for url in urls}
+    pending = list(urls)
+    started = time.perf_counter()
+    repetition = 0
+
+    while pending and repetition < args.runs:
+        repetition += 1
+        order = random.sample(pending, len(pending))
+        print(f"\n{'#'*70}")
+        print(f"REPETITION {repetition}: {', '.join(SERVER_NAMES.get(url, url) for url in order)}")
+        print(f"{'#'*70}")
+
+        for url in order:
+            if args.time_budget and time.perf_counter() - started >= args.time_budget:
+                print(f"\n⏱ Time budget of {args.time_budget:g} s used up during repetition {repetition}")
+                return runs
+            if args.manage_servers:
+                result = await run_managed_target(url, args, lambda: run_target(url, args))
+                if not result:
+                    # A server that cannot be launched will not start next time either
+                    pending.remove(url)
+                    continue
+                (benchmark_stats, stress_stats), server_stats = result
+            else:
+                await asyncio.sleep(1)  # Brief pause between servers
+                benchmark_stats, stress_stats = await run_target(url, args)
+                server_stats = None
+            runs[url].append((benchmark_stats, stress_stats, server_stats))
+
+        for url in list(pending):
+            if converged(runs[url], args):
+                print(f"✓ {SERVER_NAMES.get(url, url)}: {args.confidence:.0%} confidence intervals within "
+                      f"±{args.ci_width:.0%} after {len(runs[url])} runs")
+                pending.remove(url)
+
+    for url in pending:
+        print(f"⚠ {SERVER_NAMES.get(url, url)}: confidence intervals still wider than ±{args.ci_width:.0%} "
+              f"after {len(runs[url])} runs")
+    return runs
+
+
+def compare_repeated(runs: Dict[str, List[tuple]], args: argparse.Namespace):
+    """Summarise repeated runs as mean ± confidence interval, declaring winners only on significant differences"""
+    samples = {url: run_samples(url_runs) for url, url_runs in runs.items()}
+    keys = sorted({key for url_samples in samples.values() for key in url_samples},
+                  key=lambda key: (key[0] != "benchmark", OPERATIONS.index(key[1]) if key[1] in OPERATIONS else 0))
+
+    print(f"\n{'='*70}")
+    print(f"REPEATED RUNS SUMMARY ({args.confidence:.0%} confidence intervals)")
+    print(f"{'='*70}")
+    for key in keys:
+        print(f"\n{key[0].capitalize()} {key[1]}:")
+        print(f"  {'Server':<25} {'Runs':<6} {'Req/sec':<22} {'P99':<20}")
+        print(f"  {'-'*73}")
+        candidates = {metric: [] for metric, _, _ in REPEATED_METRICS}
+        for url in ALL_URLS:
+            metrics = samples.get(url, {}).get(key)
+            if not metrics:
+                continue
+            server_name = SERVER_NAMES.get(url, url)
+            cells = []
+            for metric, _, _ in REPEATED_METRICS:
+                values = metrics[metric]
+                average, half_width = confidence_interval(values, args.confidence)
+                cells.append(f"{average:.2f} ± {half_width:.2f}" if len(values) > 1 else f"{average:.2f}")
+                candidates[metric].append((server_name, average, stdev(values), len(values)))
+            print(f"  {server_name:<25} {len(metrics['p99']):<6} {cells[0]:<22} {cells[1]:<20}")
+        for metric, label, higher_is_better in REPEATED_METRICS:
+            print_winner(f"Best {label}", candidates[metric], higher_is_better, args.alpha)
+    print(f"\n{'='*70}\n")
+
+
+def print_sweep(url: str, label: str, points: Dict):
+    """Print one server's throughput and latency at each point of a sweep"""
+    print(f"{label} Sweep - {SERVER_NAMES.get(url, url)}:")
+    print(f"  {label:<14} {'Req/sec':<12} {'Mean':<10} {'Median':<10} {'P99':<10} {'Errors':<10}")
+    print(f"  {'-'*66}")
+    client_bound = False
+    for point, stats in points.items():
+        if not stats:
+            print(f"  {point:<14} {'all requests failed'}")
+            continue
+        error_rate = stats['failed'] / stats['total'] * 100 if stats['total'] else 0
+        label = f"{point} *" if stats.get("client_bound") else f"{point}"
+        client_bound = client_bound or bool(stats.get("client_bound"))
+        print(f"  {label:<14} {stats['req_per_sec']:<12.2f} {stats['mean']:<10.2f} {stats['median']:<10.2f} {stats['p99']:<10.2f} {f'{error_rate:.1f}%':<10}")
+    if client_bound:
+        print(f"\n  * Client-bound: the load generator saturated, so this point measures the client, not the server")
+    print(f"{'='*70}\n")
+
+
+def compare_sweeps(label: str, sweep_results: Dict, alpha: float):
+    """Print each server's throughput at every sweep point side by side, naming a winner per point
+    only when it is significantly ahead on per-interval throughput"""
+    points = sorted({point for server_points in sweep_results.values() for point in server_points})
+    print(f"\n{label} Sweep Comparison (req/sec):")
+    print(f"{'='*70}")
+    print(f"  {'Server':<25} " + " ".join(f"{point:<10}" for point in points))
+    print(f"  {'-'*(25 + 11 * len(points))}")
+    for url in ALL_URLS:
+        if url in sweep_results:
+            cells = []
+            for point in points:
+                stats = sweep_results[url].get(point)
+                cells.append(f"{stats['req_per_sec']:<10.0f}" if stats else f"{'-':<10}")
+            print(f"  {SERVER_NAMES.get(url, url):<25} " + " ".join(cells))
+    for point in points:
+        candidates = [
+            throughput_candidate(SERVER_NAMES.get(url, url), sweep_results[url][point])
+            for url in ALL_URLS if url in sweep_results and sweep_results[url].get(point)
+        ]
+        print_winner(f"{label} {point}", candidates, higher_is_better=True, alpha=alpha)
+    print(f"{'='*70}\n")
+
+
+async def connection_sweep(url: str, args: argparse.Namespace) -> Dict[int, Dict]:
+    """Rerun the stress phase once per connection count; each count sets both the worker count and the pool size"""
+    points = {}
+    for connections in args.connection_sweep:
+        point_args = argparse.Namespace(**{**vars(args), "connections": connections, "max_in_flight": connections})
+        print(f"\n▶ {SERVER_NAMES.get(url, url)} with {connections} connection(s)")
+        points[connections] = await run_stress_phase(url, point_args)
+        await asyncio.sleep(1)  # Let closed sockets drain before the next point
+    print_sweep(url, "Connections", points)
+    return points
+
+
+def ramp_levels(start: float, factor: float, maximum: float) -> List[float]:
+    """Geometric load levels from start up to and including maximum"""
+    levels = []
+    level = start
+    while level < maximum:
+        levels.append(level)
+        level = max(level * factor, level + 1)
+    levels.append(maximum)
+    return levels
+
+
+def slo_violation(stats: Optional[Dict], args: argparse.Namespace) -> Optional[str]:
+    """Why a ramp step broke the SLO, or None if the server sustained the load"""
+    if not stats:
+        return "all requests failed"
+    error_rate = stats["failed"] / stats["total"] * 100
+    if error_rate > args.max_error_rate:
+        return f"error rate {error_rate:.2f}% > {args.max_error_rate:g}%"
+    if stats["p99"] > args.slo_p99:
+        return f"p99 {stats['p99']:.2f} ms > {args.slo_p99:g} ms"
+    if "target_rate" in stats:
+        if stats["dropped"]:
+            return f"{stats['dropped']} arrivals dropped at the in-flight cap"
+        if stats["req_per_sec"] < stats["target_rate"] * 0.95:
+            return f"achieved {stats['req_per_sec']:.0f} of {stats['target_rate']:.0f} req/sec"
+    return None
+
+
+def max_sustainable(points: Dict) -> Optional[tuple]:
+    """(level, stats) of the highest-throughput ramp step that met the SLO"""
+    sustained = [(level, stats) for level, stats in points.items() if stats and not stats["slo_violation"]]
+    return max(sustained, key=lambda point: point[1]["req_per_sec"], default=None)
+
+
+async def find_saturation(url: str, args: argparse.Namespace) -> Dict[float, Dict]:
+    """Step the concurrency or offered rate up until the p99 SLO or the error budget is broken.
+
+    Every step runs a full stress phase, so the result is the latency-vs-load
+    curve up to and including the first step that broke the SLO. The ramp
+    also stops at the first client-bound step, since any higher step would
+    measure the load generator rather than the server.
+    """
+    server_name = SERVER_NAMES.get(url, url)
+    by_rate = args.saturate == "rate"
+    unit = "req/sec" if by_rate else "connection(s)"
+    points = {}
+    for level in ramp_levels(args.ramp_start, args.ramp_factor, args.ramp_max):
+        level = level if by_rate else int(level)
+        if by_rate:
+            point_args = argparse.Namespace(**{**vars(args), "load_model": "open", "rate": level})
+        else:
+            point_args = argparse.Namespace(**{**vars(args), "load_model": "closed", "connections": level})
+        print(f"\n▶ {server_name} at {level:g} {unit}")
+        stats = await run_stress_phase(url, point_args)
+        violation = slo_violation(stats, args)
+        if stats:
+            stats["slo_violation"] = violation
+        points[level] = stats
+        if violation:
+            print(f"  ✋ SLO broken at {level:g} {unit}: {violation}\n")
+            break
+        if stats.get("client_bound"):
+            print(f"  ✋ Load generator saturated at {level:g} {unit}; stopping the ramp. "
+                  f"Add --processes or use --engine raw to go higher\n")
+            break
+        await asyncio.sleep(1)  # Let the server settle before the next step
+
+    print_sweep(url, "Rate" if by_rate else "Concurrency", points)
+    best = max_sustainable(points)
+    if best:
+        level, stats = best
+        print(f"  Max sustainable throughput: {stats['req_per_sec']:.2f} req/sec at {level:g} {unit} (p99 {stats['p99']:.2f} ms)")
+        if stats.get("client_bound"):
+            print(f"  ⚠ That step was client-bound, so this is a limit of the load generator; "
+                  f"the server may sustain more")
+    else:
+        print(f"  ❌ No step met the SLO (p99 <= {args.slo_p99:g} ms, errors <= {args.max_error_rate:g}%)")
+    print(f"{'='*70}\n")
+    return points
+
+
+def compare_saturation(sweep_results: Dict, args: argparse.Namespace):
+    """Print each server's maximum sustainable throughput under the SLO"""
+    unit = "Rate" if args.saturate == "rate" else "Concurrency"
+    print(f"\nMax Sustainable Throughput (p99 <= {args.slo_p99:g} ms, errors <= {args.max_error_rate:g}%):")
+    print(f"{'='*70}")
+    print(f"  {'Server':<25} {'Req/sec':<12} {unit:<12} {'P99':<10} {'Broke at':<12}")
+    print(f"  {'-'*71}")
+    candidates = []
+    client_bound = False
+    for url in ALL_URLS:
+        if url not in sweep_results:
+            continue
+        server_name = SERVER_NAMES.get(url, url)
+        points = sweep_results[url]
+        broke_at = next((f"{level:g}" for level, stats in points.items() if not stats or stats["slo_violation"]), "-")
+        best = max_sustainable(points)
+        if not best:
+            print(f"  {server_name:<25} {'-':<12} {'-':<12} {'-':<10} {broke_at:<12}")
+            continue
+        level, stats = best
+        label = server_name
+        if stats.get("client_bound"):
+            label += " *"
+            client_bound = True
+        print(f"  {label:<25} {stats['req_per_sec']:<12.2f} {level:<12g} {stats['p99']:<10.2f} {broke_at:<12}")
+        candidates.append(throughput_candidate(server_name, stats))
+    if client_bound:
+        print(f"\n  * Client-bound: the load generator saturated first, so this is a lower bound for the server")
+    print_winner("Highest Sustainable Throughput", candidates, higher_is_better=True, alpha=args.alpha)
+    print(f"{'='*70}\n")
+
+
+async def count_users(session: aiohttp.ClientSession, base_url: str) -> int:
+    """Number of users a server stores, found by probing GET /users?offset=N&limit=1.
+
+    The servers do not report a total, so this doubles the offset until a page
+    comes back empty and then bisects, using about 2*log2(N) requests.
+    """
+    async def exists(index: int) -> bool:
+        async with session.get(f"{base_url}/users", params={"limit": 1, "offset": index}) as response:
+            return bool(await response.json())
+
+    if not await exists(0):
+        return 0
+    low, high = 0, 1
+    while await exists(high):
+        low, high = high, high * 2
+    # users[low] exists and users[high] does not
+    while high - low > 1:
+        middle = (low + high) // 2
+        if await exists(middle):
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def _populate_shard(base_url: str, count: int, first_id: int, concurrent: int) -> int:
+    return len(asyncio.run(prepopulate_users(base_url, count, first_id, concurrent)))
+
+
+async def populate_to(base_url: str, size: int, concurrent: int, processes: int = 1) -> tuple:
+    """Create users until the server stores `size` of them.
+
+    Returns (users created, seconds taken). Creation is spread over the load
+    generator processes, each keeping `concurrent` requests in flight.
+    """
+    async with aiohttp.ClientSession() as session:
+        stored = await count_users(session, base_url)
+    missing = size - stored
+    if missing <= 0:
+        return 0, 0.0
+
+    start = time.perf_counter()
+    processes = max(1, min(processes, missing))
+    # Continue the numbering of the users already stored
+    first_id = stored + 1
+    if processes > 1:
+        shard_args = [
+            (base_url, shard_count, first_id + i * 100_000_000, concurrent)
+            for i, shard_count in enumerate(split_evenly(missing, processes))
+        ]
+        created = sum(await run_sharded(_populate_shard, shard_args))
+    else:
+        created = len(await prepopulate_users(base_url, missing, first_id, concurrent))
+    return created, time.perf_counter() - start
+
+
+def page_offsets(size: int, limit: int) -> List[int]:
+    """Offsets measured at each dataset size: the first page, the middle and the last full page"""
+    return sorted({0, max(0, size // 2), max(0, size - limit)})
+
+
+async def dataset_scaling(url: str, args: argparse.Namespace) -> Dict[str, Dict]:
+    """Grow the server's store through each dataset size and measure GET_ALL pages at every size.
+
+    Every server handler copies the whole users Map before slicing out a page,
+    so page latency tracks the total number of users rather than the page size.
+    """
+    server_name = SERVER_NAMES.get(url, url)
+    port = urlparse(url).port
+    points = {}
+
+    print(f"\n{'='*70}")
+    print(f"Dataset Scaling - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {url}")
+    print(f"Dataset Sizes: {', '.join(str(size) for size in args.dataset_sweep)}")
+    print(f"Page Limits: {', '.join(str(limit) for limit in args.dataset_limits)}")
+    print(f"Requests per Page Shape: {args.dataset_requests}")
+    print(f"{'='*70}\n")
+
+    for size in sorted(args.dataset_sweep):
+        print(f"▶ Populating to {size} users ({args.populate_concurrency} in flight per process)...")
+        created, populate_time = await populate_to(url, size, args.populate_concurrency, args.processes)
+        async with aiohttp.ClientSession() as session:
+            stored = await count_users(session, url)
+        populate_rate = created / populate_time if populate_time else 0
+        print(f"  Created {created} users in {populate_time:.2f} s ({populate_rate:.0f} users/sec); server stores {stored}")
+
+        pid = find_server_pid(port) if port else None
+        process = read_tree_stats(pid) if pid else None
+        rss_mb = process["rss_bytes"] / 1024 / 1024 if process else None
+
+        async with create_session(args.dataset_concurrency) as session:
+            for limit in args.dataset_limits:
+                for offset in page_offsets(stored, limit):
+                    recorder = OperationRecorder()
+                    start = time.perf_counter()
+                    await run_with_workers(
+                        get_all_users, [(session, url, limit, offset)] * args.dataset_requests,
+                        args.dataset_concurrency, recorder
+                    )
+                    wall_time = time.perf_counter() - start
+                    if not recorder.successful:
+                        points[f"users={size} limit={limit} offset={offset}"] = None
+                        continue
+                    points[f"users={size} limit={limit} offset={offset}"] = {
+                        "users": stored,
+                        "limit": limit,
+                        "offset": offset,
+                        "total": recorder.total,
+                        "successful": recorder.successful,
+                        "failed": recorder.failed,
+                        "total_time": wall_time,
+                        "req_per_sec": recorder.successful / wall_time,
+                        "bytes_received": recorder.bytes_received,
+                        **recorder.histogram.summary(),
+                        "rss_mb": rss_mb,
+                        "populate_users_per_sec": populate_rate,
+                        "histogram": recorder.histogram,
+                    }
+        print()
+
+    print_dataset_scaling(url, points)
+    return points
+
+
+def print_dataset_scaling(url: str, points: Dict[str, Dict]):
+    print(f"Dataset Scaling Results - {SERVER_NAMES.get(url, url)}:")
+    print(f"  {'Users':<10} {'RSS MB':<9} {'Limit':<7} {'Offset':<10} {'Req/sec':<12} {'Mean':<10} {'Median':<10} {'P99':<10}")
+    print(f"  {'-'*82}")
+    for label, stats in points.items():
+        if not stats:
+            print(f"  {label:<40} all requests failed")
+            continue
+        rss = f"{stats['rss_mb']:.1f}" if stats["rss_mb"] is not None else "-"
+        print(f"  {stats['users']:<10} {rss:<9} {stats['limit']:<7} {stats['offset']:<10} {stats['req_per_sec']:<12.2f} "
+              f"{stats['mean']:<10.2f} {stats['median']:<10.2f} {stats['p99']:<10.2f}")
+    print(f"{'='*70}\n")
+
+
+def compare_dataset_scaling(sweep_results: Dict, args: argparse.Namespace):
+    """Print how first-page and last-page latency and server memory grow with the number of stored users"""
+    sizes = sorted(args.dataset_sweep)
+    limit = 100 if 100 in args.dataset_limits else args.dataset_limits[0]
+
+    def by_size(url: str) -> Dict[int, List[Dict]]:
+        pages = {}
+        for stats in sweep_results[url].values():
+            if stats and stats["limit"] == limit:
+                pages.setdefault(min(sizes, key=lambda size: abs(size - stats["users"])), []).append(stats)
+        return pages
+
+    for title, pick, value in (
+        (f"First Page (limit {limit}) Median ms", min, lambda stats: f"{stats['median']:.2f}"),
+        (f"Last Page (limit {limit}) Median ms", max, lambda stats: f"{stats['median']:.2f}"),
+        ("Server RSS MB", min, lambda stats: f"{stats['rss_mb']:.1f}" if stats["rss_mb"] is not None else "-"),
+    ):
+        print(f"\nDataset Scaling Comparison - {title}:")
+        print(f"{'='*70}")
+        print(f"  {'Server':<25} " + " ".join(f"{size:<10}" for size in sizes))
+        print(f"  {'-'*(25 + 11 * len(sizes))}")
+        for url in ALL_URLS:
+            if url not in sweep_results:
+                continue
+            pages = by_size(url)
+            cells = []
+            for size in sizes:
+                if size in pages:
+                    cells.append(f"{value(pick(pages[size], key=lambda stats: stats['offset'])):<10}")
+                else:
+                    cells.append(f"{'-':<10}")
+            print(f"  {SERVER_NAMES.get(url, url):<25} " + " ".join(cells))
+    print(f"{'='*70}\n")
+
+
+async def execute_payload(base_url: str, generator: PayloadGenerator, duration_seconds: int, concurrent: int,
+                          chunk_size: Optional[int] = None) -> tuple:
+    """Closed-loop workers that each create a user with a generated body, update it with another and delete it.
+
+    Returns (recorders, bytes sent per operation, elapsed seconds). Deleting
+    each user keeps the server's memory flat however large the bodies are.
+    """
+    end_time = time.perf_counter() + duration_seconds
+    recorders = {}
+    sent = {"CREATE": 0, "UPDATE": 0}
+    next_id = 0
+
+    async def worker(session: aiohttp.ClientSession):
+        nonlocal next_id
+        while time.perf_counter() < end_time:
+            next_id += 1
+            body = generator.body(next_id)
+            result = await send_payload(session, base_url, "CREATE", None, body, chunk_size)
+            record_result(recorders, result)
+            sent["CREATE"] += len(body)
+            if not result["success"]:
+                continue
+            user_id = result["data"]["id"]
+            body = generator.body(next_id)
+            result = await send_payload(session, base_url, "UPDATE", user_id, body, chunk_size)
+            record_result(recorders, result)
+            sent["UPDATE"] += len(body)
+            await delete_user(session, base_url, user_id)
+
+    start = time.perf_counter()
+    async with create_session(concurrent) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrent)))
+    return recorders, sent, time.perf_counter() - start
+
+
+async def payload_sweep(url: str, args: argparse.Namespace) -> Dict[int, Dict]:
+    """Run the CREATE/UPDATE payload loop at each body size and report req/s and MB/s per operation"""
+    server_name = SERVER_NAMES.get(url, url)
+    chunk_size = args.payload_chunk_size if args.payload_chunked else None
+    points = {}
+
+    print(f"\n{'='*70}")
+    print(f"Payload Sweep - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {url}")
+    print(f"Body Sizes: {', '.join(format_size(size) for size in args.payload_sweep)} ({args.payload_distribution})")
+    print(f"Extra Fields: {args.payload_fields}")
+    if chunk_size:
+        print(f"Transfer Encoding: chunked ({format_size(chunk_size)} chunks)")
+    print(f"Duration per Size: {args.duration} seconds")
+    print(f"Concurrent Workers: {args.payload_concurrency}")
+    print(f"{'='*70}\n")
+
+    for size in args.payload_sweep:
+        print(f"▶ {format_size(size)} bodies...")
+        generator = PayloadGenerator(size, args.payload_fields, args.payload_distribution)
+        recorders, sent, elapsed = await execute_payload(url, generator, args.duration, args.payload_concurrency, chunk_size)
+        overall = combine(recorders[operation] for operation in ("CREATE", "UPDATE") if operation in recorders)
+        if not overall.successful:
+            print(f"  ❌ All requests failed at {format_size(size)}")
+            points[size] = None
+            continue
+
+        stats = {
+            "size": size,
+            "total": overall.total,
+            "successful": overall.successful,
+            "failed": overall.failed,
+            "total_time": elapsed,
+            "req_per_sec": overall.successful / elapsed,
+            "mb_per_sec_sent": sum(sent.values()) / elapsed / 1024 / 1024,
+            "mb_per_sec_received": overall.bytes_received / elapsed / 1024 / 1024,
+            **overall.histogram.summary(),
+            "histogram": overall.histogram,
+            "operations": {},
+        }
+        for operation in ("CREATE", "UPDATE"):
+            recorder = recorders.get(operation)
+            if recorder:
+                stats["operations"][operation] = {
+                    "total": recorder.total,
+                    "failed": recorder.failed,
+                    "req_per_sec": recorder.successful / elapsed,
+                    "mb_per_sec_sent": sent[operation] / elapsed / 1024 / 1024,
+                    "mb_per_sec_received": recorder.bytes_received / elapsed / 1024 / 1024,
+                    **recorder.histogram.summary(),
+                }
+        points[size] = stats
+        await asyncio.sleep(1)  # Let the server collect the freed bodies before the next size
+
+    print_payload_sweep(url, points)
+    return points
+
+
+def print_payload_sweep(url: str, points: Dict[int, Dict]):
+    print(f"Payload Sweep Results - {SERVER_NAMES.get(url, url)}:")
+    print(f"  {'Size':<9} {'Operation':<10} {'Req/sec':<11} {'MB/s sent':<11} {'MB/s recv':<11} {'Mean':<10} {'P99':<10} {'Errors':<8}")
+    print(f"  {'-'*84}")
+    for size, stats in points.items():
+        if not stats:
+            print(f"  {format_size(size):<9} all requests failed")
+            continue
+        for operation, op_stats in stats["operations"].items():
+            error_rate = op_stats["failed"] / op_stats["total"] * 100 if op_stats["total"] else 0
+            print(f"  {format_size(size):<9} {operation:<10} {op_stats['req_per_sec']:<11.2f} {op_stats['mb_per_sec_sent']:<11.2f} "
+                  f"{op_stats['mb_per_sec_received']:<11.2f} {op_stats['mean']:<10.2f} {op_stats['p99']:<10.2f} {f'{error_rate:.1f}%':<8}")
+    print(f"{'='*70}\n")
+
+
+def compare_payload_sweeps(sweep_results: Dict, args: argparse.Namespace):
+    """Print each server's request and byte throughput at every body size"""
+    sizes = args.payload_sweep
+    for title, metric, precision in (("req/sec", "req_per_sec", 0), ("MB/s sent", "mb_per_sec_sent", 2)):
+        print(f"\nPayload Sweep Comparison ({title}, CREATE + UPDATE):")
+        print(f"{'='*70}")
+        print(f"  {'Server':<25} " + " ".join(f"{format_size(size):<10}" for size in sizes))
+        print(f"  {'-'*(25 + 11 * len(sizes))}")
+        for url in ALL_URLS:
+            if url in sweep_results:
+                cells = []
+                for size in sizes:
+                    stats = sweep_results[url].get(size)
+                    cells.append(f"{stats[metric]:<10.{precision}f}" if stats else f"{'-':<10}")
+                print(f"  {SERVER_NAMES.get(url, url):<25} " + " ".join(cells))
+    print(f"{'='*70}\n")
+
+
+async def core_scaling(url: str, args: argparse.Namespace) -> Dict[int, Dict]:
+    """Launch a clustered server with each worker count in --core-sweep and run the stress phase against it.
+
+    When the host has CPUs to spare, the server is pinned to as many CPUs as
+    it has workers and the load generator to the rest, so each step measures
+    that many cores. Speedup and efficiency are relative to the smallest worker count.
+    Every request is a store round trip to the primary, so they include how
+    fast the primary answers IPC, not just what the extra workers add.
+    """
+    server_name = SERVER_NAMES.get(url, url)
+    cpus = sorted(os.sched_getaffinity(0))
+    points = {}
+
+    print(f"\n{'='*70}")
+    print(f"Core Scaling - {server_name}")
+    print(f"{'='*70}")
+    print(f"Target: {url}")
+    print(f"Workers: {', '.join(str(workers) for workers in args.core_sweep)}")
+    print(f"Host CPUs: {len(cpus)}")
+    print(f"{'='*70}\n")
+
+    for workers in args.core_sweep:
+        server_cpus = cpus[:workers] if workers < len(cpus) else None
+        placement = f"on CPUs {','.join(map(str, server_cpus))}" if server_cpus else "sharing all CPUs with the client"
+        print(f"▶ {workers} worker(s) {placement}")
+        if server_cpus:
+            os.sched_setaffinity(0, cpus[workers:])
+        try:
+            result = await run_managed_target(url, args, lambda: run_stress_phase(url, args), server_cpus, workers)
+        finally:
+            os.sched_setaffinity(0, cpus)
+        stats = result[0] if result else None
+        if stats:
+            stats["workers"] = workers
+            stats["server"] = result[1]
+        points[workers] = stats
+
+    measured = [workers for workers, stats in points.items() if stats]
+    if measured:
+        base = points[measured[0]]
+        for workers in measured:
+            stats = points[workers]
+            stats["speedup"] = stats["req_per_sec"] / base["req_per_sec"]
+            stats["efficiency"] = stats["speedup"] / (workers / base["workers"])
+
+    print_core_scaling(url, points)
+    return points
+
+
+SHARED_STORE_NOTE = ("Clustered servers keep every user in the primary and each request makes an IPC round trip\n"
+                     "  to it, so speedup and efficiency show the cost of that shared store as well as runtime\n"
+                     "  scaling; read them as how well this design scales, not the runtime alone.")
+
+
+def print_core_scaling(url: str, points: Dict[int, Dict]):
+    print(f"Core Scaling Results - {SERVER_NAMES.get(url, url)}:")
+    print(f"  {'Workers':<9} {'Req/sec':<12} {'Speedup':<9} {'Efficiency':<12} {'P99':<10} {'Req/CPU-s':<12} {'Peak MB':<10}")
+    print(f"  {'-'*78}")
+    for workers, stats in points.items():
+        if not stats:
+            print(f"  {workers:<9} failed")
+            continue
+        resources = stats.get("resources")
+        efficiency = f"{stats['req_per_cpu_sec']:<12.2f} {resources['rss_peak_mb']:<10.1f}" if resources else f"{'-':<12} {'-':<10}"
+        print(f"  {workers:<9} {stats['req_per_sec']:<12.2f} {stats['speedup']:<9.2f} {stats['efficiency']:<12.1%} "
+              f"{stats['p99']:<10.2f} {efficiency}")
+    print(f"\n  {SHARED_STORE_NOTE}")
+    print(f"{'='*70}\n")
+
+
+def compare_core_scaling(sweep_results: Dict):
+    """Throughput per worker count for every server, and how efficiently each used its largest count"""
+    levels = sorted({workers for points in sweep_results.values() for workers in points})
+    print(f"\nCore Scaling Comparison (req/sec, efficiency at the largest worker count):")
+    print(f"{'='*70}")
+    print(f"  {'Server':<27} " + " ".join(f"{f'{workers} w':<10}" for workers in levels) + f" {'Efficiency':<10}")
+    print(f"  {'-'*(39 + 11 * len(levels))}")
+    for url in ALL_URLS:
+        points = sweep_results.get(url)
+        if not points:
+            continue
+        cells = " ".join(f"{points[workers]['req_per_sec']:<10.0f}" if points.get(workers) else f"{'-':<10}" for workers in levels)
+        largest = next((points[workers] for workers in reversed(levels) if points.get(workers)), None)
+        efficiency = f"{largest['efficiency']:.1%}" if largest else "-"
+        print(f"  {SERVER_NAMES.get(url, url):<27} {cells} {efficiency:<10}")
+    print(f"\n  {SHARED_STORE_NOTE}")
+    print(f"{'='*70}\n")
+
+
+def raise_open_file_limit(needed: int) -> int:
+    """Raise the soft open-file limit towards needed (capped by the hard limit) and return the new limit"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    return soft
+
+
+def print_server_stats(url: str, stats: Dict):
+    print(f"Server Process - {SERVER_NAMES.get(url, url)}:")
+    print(f"  Startup Latency:   {stats['startup_ms']:.1f} ms")
+    if "rss_peak_mb" in stats:
+        print(f"  Peak RSS:          {stats['rss_peak_mb']:.1f} MB")
+        print(f"  Mean RSS:          {stats['rss_mean_mb']:.1f} MB")
+        print(f"  CPU Time:          {stats['cpu_seconds']:.2f} s ({stats['cpu_percent']:.1f}% of one core)")
+    print(f"{'='*70}\n")
+
+
+async def run_managed_target(url: str, args: argparse.Namespace, measure, cpus: Optional[List[int]] = None,
+                             workers: Optional[int] = None):
+    """Launch a fresh server, warm it up, run measure() while sampling the server process, then stop it.
+
+    measure is a coroutine function returning the phase results. workers
+    (default --workers) sets the worker count of a clustered server.
+    Returns (results, server_stats), or None if the server failed to start.
+    """
+    server_name = SERVER_NAMES.get(url, url)
+    workers = workers or args.workers
+    server = ManagedServer(url, cpus, args.sample_interval, {"WORKERS": str(workers)} if workers else None)
+    try:
+        startup_time = await server.start(timeout=args.startup_timeout)
+    except RuntimeError as e:
+        print(f"❌ Could not start {server_name}: {e}\n")
+        return None
+
+    try:
+        print(f"🚀 Started {server_name} (PID {server.pid}) in {startup_time * 1000:.1f} ms")
+        if args.server_warmup:
+            print(f"   Warming up with {args.server_warmup} requests per operation...")
+            await execute_benchmark(url, args.server_warmup, 100, verbose=False)
+        server.start_sampling()
+        results = await measure()
+        resources = await server.stop_sampling()
+    finally:
+        await server.stop()
+
+    server_stats = {"startup_ms": startup_time * 1000, "pid": server.pid, **resources}
+    print_server_stats(url, server_stats)
+    return results, server_stats
+
+
+def plan_cpu_slots(cpus: List[int], server_cpus: int, client_cpus: int) -> List[Tuple[List[int], List[int]]]:
+    """Carve the CPUs into disjoint (server CPUs, client CPUs) slots, one per concurrently running target"""
+    slot_size = server_cpus + client_cpus
+    return [
+        (cpus[start:start + server_cpus], cpus[start + server_cpus:start + slot_size])
+        for start in range(0, len(cpus) - slot_size + 1, slot_size)
+    ]
+
+
+def pin_server(url: str, cpus: List[int]) -> bool:
+    """Pin the server listening on the port, with any worker processes, to the given CPUs"""
+    pid = find_server_pid(urlparse(url).port)
+    if pid is None or not all([pin_process(member, cpus) for member in process_tree(pid)]):
+        print(f"  ⚠️  Could not pin {SERVER_NAMES.get(url, url)}: no accessible process listening on its port")
+        return False
+    return True
+
+
+def _target_job(url: str, args: argparse.Namespace, client_cpus: List[int]) -> tuple:
+    """Run one target in a pinned worker process, capturing everything it and its shards print"""
+    os.sched_setaffinity(0, client_cpus)
+    # Spawned workers start from the module defaults, like load generator shards
+    configure_body_policy(args.body_policy)
+    configure_connections(args.connection_pool)
+    with tempfile.TemporaryFile() as capture:
+        # Redirect at the file descriptor level so load generator shards are captured too
+        sys.stdout.flush()
+        saved_stdout = os.dup(1)
+        os.dup2(capture.fileno(), 1)
+        try:
+            benchmark_stats, stress_stats = asyncio.run(run_target(url, args))
+        finally:
+            sys.stdout.flush()
+            os.dup2(saved_stdout, 1)
+            os.close(saved_stdout)
+        capture.seek(0)
+        output = capture.read().decode("utf-8", errors="replace")
+    return benchmark_stats, stress_stats, output
+
+
+async def run_orchestrated(urls: List[str], args: argparse.Namespace) -> tuple:
+    """Benchmark targets with each server and its load generator pinned to disjoint CPUs.
+
+    Targets run concurrently when there are enough CPUs for two or more slots,
+    otherwise one at a time.
+    """
+    cpus = sorted(os.sched_getaffinity(0))
+    client_cpus = max(1, args.processes)
+    slots = plan_cpu_slots(cpus, args.server_cpus, client_cpus)
+    benchmark_results = {}
+    stress_results = {}
+    server_results = {}
+
+    async def run_pinned(url: str, measure, server_cpus: Optional[List[int]]):
+        if args.manage_servers:
+            result = await run_managed_target(url, args, measure, server_cpus)
+            if result:
+                (benchmark_results[url], stress_results[url]), server_results[url] = result
+        else:
+            if server_cpus:
+                pin_server(url, server_cpus)
+            benchmark_results[url], stress_results[url] = await measure()
+
+    print(f"Orchestrator: {len(cpus)} CPU(s), {args.server_cpus} per server + {client_cpus} per load generator")
+
+    if len(slots) < 2:
+        if slots:
+            server_cpus, client_cpus = slots[0]
+            print(f"Only one CPU slot available; running targets sequentially "
+                  f"(server on CPUs {server_cpus}, client on CPUs {client_cpus})\n")
+            os.sched_setaffinity(0, client_cpus)
+        else:
+            print("Not enough CPUs to isolate server and client; running targets sequentially without pinning\n")
+        for url in urls:
+            await run_pinned(url, lambda: run_target(url, args), server_cpus if slots else None)
+        return benchmark_results, stress_results, server_results
+
+    print(f"Running up to {len(slots)} targets in parallel\n")
+    free_slots = asyncio.Queue()
+    for slot in slots:
+        free_slots.put_nowait(slot)
+    loop = asyncio.get_running_loop()
+
+    with ProcessPoolExecutor(max_workers=len(slots), mp_context=multiprocessing.get_context("spawn")) as pool:
+        async def run_in_slot(url: str):
+            server_cpus, client_cpus = await free_slots.get()
+
+            async def measure():
+                benchmark_stats, stress_stats, output = await loop.run_in_executor(
+                    pool, _target_job, url, args, client_cpus
+                )
+                print(output)
+                return benchmark_stats, stress_stats
+
+            try:
+                print(f"  ▶ {SERVER_NAMES.get(url, url)}: server on CPUs {server_cpus}, client on CPUs {client_cpus}")
+                await run_pinned(url, measure, server_cpus)
+            finally:
+                free_slots.put_nowait((server_cpus, client_cpus))
+
+        await asyncio.gather(*(run_in_slot(url) for url in urls))
+
+    # Report in the usual server order regardless of completion order
+    return tuple({url: results[url] for url in urls if url in results}
+                 for results in (benchmark_results, stress_results, server_results))
+
+
+def select_sweep(args: argparse.Namespace) -> Optional[tuple]:
+    """The sweep requested on the command line, if any.
+
+    Returns (coroutine function run per server, phase name in the saved results,
+    function printing the cross-server comparison, most connections it opens).
+    """
+    if args.connection_sweep:
+        return (connection_sweep, "connections",
+                lambda results: compare_sweeps("Connections", results, args.alpha), max(args.connection_sweep))
+    if args.saturate:
+        def compare(results: Dict):
+            compare_sweeps("Rate" if args.saturate == "rate" else "Concurrency", results, args.alpha)
+            compare_saturation(results, args)
+        connections = args.max_in_flight if args.saturate == "rate" else args.ramp_max
+        return find_saturation, "saturation", compare, int(connections)
+    if args.payload_sweep:
+        return (payload_sweep, "payload", lambda results: compare_payload_sweeps(results, args),
+                args.payload_concurrency)
+    if args.dataset_sweep:
+        return (dataset_scaling, "dataset", lambda results: compare_dataset_scaling(results, args),
+                max(args.populate_concurrency, args.dataset_concurrency))
+    if args.core_sweep:
+        return core_scaling, "cores", compare_core_scaling, max(args.connections, args.max_in_flight)
+    return None
+
+
+async def main(args: argparse.Namespace):
     """Main function to run all tests"""
+    configure_body_policy(args.body_policy)
+    configure_connections(args.connection_pool)
+
     print("\n" + "="*70)
     print("SERVER PERFORMANCE TESTING")
     print("="*70)
     
-    # Check which servers are running
-    print("\nChecking server availability...")
     available_servers = []
-    
-    for url in URLS:
-        server_name = SERVER_NAMES.get(url, url)
-        is_running = await check_server(url)
-        status = "✅ Running" if is_running else "❌ Not Running"
-        print(f"  {server_name}: {status}")
-        if is_running:
-            available_servers.append(url)
-    
-    if not available_servers:
-        print("\n❌ No servers are running! Please start at least one server.")
-        return
+    targets = CLUSTER_URLS if args.cluster else URLS
+
+    if args.manage_servers:
+        # Servers are launched on demand, so only their runtimes need to be installed
+        print("\nChecking installed runtimes...")
+        for url in targets:
+            server_name = SERVER_NAMES.get(url, url)
+            launchable = can_launch(url)
+            status = "✅ Can launch" if launchable else "❌ Runtime not installed"
+            print(f"  {server_name}: {status}")
+            if launchable:
+                available_servers.append(url)
+
+        if not available_servers:
+            print("\n❌ None of the runtimes are installed!")
+            return
+    else:
+        # Check which servers are running
+        print("\nChecking server availability...")
+        
+        async with aiohttp.ClientSession() as session:
+            for url in targets:
+                server_name = SERVER_NAMES.get(url, url)
+                is_running = await check_server(session, url)
+                status = "✅ Running" if is_running else "❌ Not Running"
+                print(f"  {server_name}: {status}")
+                if is_running:
+                    available_servers.append(url)
+        
+        if not available_servers:
+            print("\n❌ No servers are running! Please start at least one server.")
+            return
     
     print(f"\n{len(available_servers)} server(s) available for testing.\n")
     
-    # Run benchmarks
-    benchmark_results = {}
-    for url in available_servers:
-        await asyncio.sleep(1)  # Brief pause between servers
-        benchmark_results[url] = await run_benchmark(url, num_requests=1000, concurrent=100)
-    
-    # Run stress tests
-    stress_results = {}
-    for url in available_servers:
-        await asyncio.sleep(1)  # Brief pause between servers
-        stress_results[url] = await stress_test(url, duration_seconds=10, concurrent=200)
+    server_results = {}
+    sweep_results = {}
+    repeated = {}
+    sweep = select_sweep(args)
+    if sweep:
+        sweep_fn, _, _, connections = sweep
+        # Each connection needs a socket, plus headroom for the rest of the process
+        needed = connections + 256
+        if raise_open_file_limit(needed) < needed:
+            print(f"⚠ The open-file limit is below {needed}; the largest sweep points will see connection errors\n")
+        benchmark_results = {}
+        stress_results = {}
+        for url in available_servers:
+            # The core sweep launches the server itself, once per worker count
+            if args.manage_servers and not args.core_sweep:
+                result = await run_managed_target(url, args, lambda: sweep_fn(url, args))
+                if result:
+                    sweep_results[url], server_results[url] = result
+            else:
+                sweep_results[url] = await sweep_fn(url, args)
+    elif args.runs > 1:
+        repeated = await run_repeated(available_servers, args)
+        benchmark_results = {}
+        stress_results = {}
+    elif args.parallel:
+        benchmark_results, stress_results, server_results = await run_orchestrated(available_servers, args)
+    elif args.manage_servers:
+        # Each server is launched fresh, so its benchmark and stress phases run back to back
+        benchmark_results = {}
+        stress_results = {}
+        for url in available_servers:
+            result = await run_managed_target(url, args, lambda: run_target(url, args))
+            if result:
+                (benchmark_results[url], stress_results[url]), server_results[url] = result
+    else:
+        # Run benchmarks
+        benchmark_results = {}
+        for url in available_servers:
+            await asyncio.sleep(1)  # Brief pause between servers
+            benchmark_results[url] = await run_benchmark(url, num_requests=1000, concurrent=100, processes=args.processes)
+        
+        # Run stress tests
+        stress_results = {}
+        for url in available_servers:
+            await asyncio.sleep(1)  # Brief pause between servers
+            stress_results[url] = await run_stress_phase(url, args)
     
     # Compare results if multiple servers were tested
-    if len(available_servers) > 1:
-        await compare_servers(benchmark_results, stress_results)
+    if repeated:
+        # Single-run tables would test per-request noise only; the summary tests run-to-run differences
+        compare_repeated(repeated, args)
+    elif len(available_servers) > 1:
+        await compare_servers(benchmark_results, stress_results, server_results, alpha=args.alpha)
+        if sweep_results:
+            sweep[2](sweep_results)
+
+    if args.output:
+        metadata = collect_metadata(SERVER_NAMES[url] for url in available_servers if url in SERVER_NAMES)
+        metadata["settings"] = {
+            "load_model": args.load_model,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "processes": args.processes,
+            "body_policy": dict(BODY_POLICY),
+            "workload": args.workload.to_dict() if args.workload else None,
+            "connections": args.connections,
+            "connection_pool": dict(CONNECTION_SETTINGS),
+            "cluster": args.cluster,
+            "workers": args.workers,
+        }
+        if args.payload_sweep:
+            metadata["settings"]["payload"] = {
+                "sizes": args.payload_sweep,
+                "extra_fields": args.payload_fields,
+                "distribution": args.payload_distribution,
+                "chunk_size": args.payload_chunk_size if args.payload_chunked else None,
+                "concurrency": args.payload_concurrency,
+            }
+        if args.dataset_sweep:
+            metadata["settings"]["dataset"] = {
+                "sizes": args.dataset_sweep,
+                "limits": args.dataset_limits,
+                "requests": args.dataset_requests,
+                "concurrency": args.dataset_concurrency,
+            }
+        if args.saturate:
+            metadata["settings"]["saturation"] = {
+                "mode": args.saturate,
+                "slo_p99": args.slo_p99,
+                "max_error_rate": args.max_error_rate,
+                "ramp": [args.ramp_start, args.ramp_factor, args.ramp_max],
+            }
+        if args.core_sweep:
+            metadata["settings"]["core_sweep"] = args.core_sweep
+        if args.runs > 1:
+            metadata["settings"]["repetition"] = {
+                "max_runs": args.runs,
+                "min_runs": args.min_runs,
+                "ci_width": args.ci_width,
+                "confidence": args.confidence,
+                "time_budget": args.time_budget,
+            }
+        if repeated:
+            # Every run is saved, tagged with its index, so compare sees the run-to-run spread
+            records = []
+            for url, runs in repeated.items():
+                for index, (benchmark_stats, stress_stats, server_stats) in enumerate(runs):
+                    for record in build_records({url: benchmark_stats}, {url: stress_stats}, SERVER_NAMES,
+                                                {url: server_stats} if server_stats else None):
+                        records.append({**record, "run": index})
+        else:
+            sweeps = {sweep[1]: sweep_results} if sweep_results else None
+            records = build_records(benchmark_results, stress_results, SERVER_NAMES, server_results, sweeps)
+        write_results(args.output, metadata, records)
+        print(f"Results written to {args.output}")
     
     print("\n✅ All tests completed!\n")
 
 
+def parse_int_list(spec: str) -> List[int]:
+    """Parse a comma-separated list of positive integers such as 1,10,100"""
+    try:
+        values = [int(value) for value in spec.split(",") if value.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {spec!r}") from None
+    if not values or any(value < 1 for value in values):
+        raise argparse.ArgumentTypeError(f"expected positive integers, got {spec!r}")
+    return values
+
+
+def parse_core_counts(spec: str) -> List[int]:
+    """Parse worker counts such as 1,2,4,N, where N is the number of CPUs this process may run on"""
+    cpus = len(os.sched_getaffinity(0))
+    counts = parse_int_list(",".join(str(cpus) if count.strip().upper() == "N" else count for count in spec.split(",")))
+    return sorted(set(counts))
+
+
+def parse_size_list(spec: str) -> List[int]:
+    """Parse a comma-separated list of byte sizes such as 100,10k,1m"""
+    try:
+        sizes = [parse_size(size) for size in spec.split(",") if size.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    if not sizes or any(size < 1 for size in sizes):
+        raise argparse.ArgumentTypeError(f"expected positive sizes, got {spec!r}")
+    return sizes
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Benchmark the Node.js, Deno and Bun CRUD servers")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Number of load generator processes, each with its own event loop and session")
+    parser.add_argument("--duration", type=int, default=10, help="Stress phase duration in seconds")
+    parser.add_argument("--warmup", type=float, default=0,
+                        help="Seconds of stress load to run before measuring; excluded from the results")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Length of the live reporting intervals in seconds")
+    parser.add_argument("--load-model", choices=["closed", "open"], default="closed",
+                        help="closed: fixed worker count; open: fixed arrival rate")
+    parser.add_argument("--rate", type=float, default=5000, help="Open-loop target rate (req/sec)")
+    parser.add_argument("--arrival", choices=["uniform", "poisson"], default="uniform",
+                        help="Open-loop arrival distribution")
+    parser.add_argument("--late-threshold", type=float, default=10,
+                        help="Open-loop: count a request as late when it is sent this many ms after its "
+                             "scheduled time")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Open-loop cap on outstanding requests; arrivals beyond it are dropped")
+    parser.add_argument("--connections", type=int, default=200,
+                        help="Concurrent workers in the closed-loop stress phase; the connection pool is sized to match")
+    parser.add_argument("--pool-limit", type=int,
+                        help="Override the total connection pool size (0 for unlimited); by default it matches "
+                             "the number of concurrent requests")
+    parser.add_argument("--pool-limit-per-host", type=int, default=0,
+                        help="Maximum connections to one host (0 for unlimited)")
+    parser.add_argument("--engine", choices=["aiohttp", "raw"], default="aiohttp",
+                        help="HTTP client: aiohttp, or a minimal HTTP/1.1 client on raw asyncio sockets with "
+                             "pre-serialised requests and less per-request overhead")
+    parser.add_argument("--pipeline", type=int, default=1,
+                        help="Raw engine: requests pipelined per connection once the pool is full "
+                             "(combine with --pool-limit below the worker count)")
+    parser.add_argument("--trace-phases", action="store_true",
+                        help="Time each stress request's queue, connect, send, TTFB and body phases "
+                             "(adds a little client overhead)")
+    parser.add_argument("--max-client-cpu", type=float, default=90,
+                        help="Mark a stress result client-bound when a load generator process uses this "
+                             "percentage of a core")
+    parser.add_argument("--max-loop-lag", type=float, default=10,
+                        help="Mark a stress result client-bound when the load generator's event-loop lag p99 "
+                             "reaches this many ms")
+    parser.add_argument("--no-keep-alive", action="store_true",
+                        help="Close each connection after one request instead of reusing it")
+    parser.add_argument("--no-dns-cache", action="store_true", help="Resolve the host name for every new connection")
+    parser.add_argument("--connection-sweep", type=parse_int_list, metavar="COUNTS",
+                        help="Rerun the stress phase at each connection count, e.g. 1,10,100,1000,5000, "
+                             "and report throughput and latency per count (replaces the benchmark and stress phases)")
+    parser.add_argument("--saturate", choices=["concurrency", "rate"],
+                        help="Ramp the concurrency (closed loop) or offered rate (open loop) step by step until the "
+                             "p99 SLO or error budget is broken, and report each server's maximum sustainable "
+                             "throughput and latency curve (replaces the benchmark and stress phases)")
+    parser.add_argument("--slo-p99", type=float, default=50, help="Saturation SLO: highest acceptable P99 in ms")
+    parser.add_argument("--max-error-rate", type=float, default=0,
+                        help="Saturation SLO: highest acceptable percentage of failed requests")
+    parser.add_argument("--ramp-start", type=float,
+                        help="First saturation step (default: 1 connection or 500 req/sec)")
+    parser.add_argument("--ramp-factor", type=float, default=2, help="Multiplier between saturation steps")
+    parser.add_argument("--ramp-max", type=float,
+                        help="Last saturation step (default: 4096 connections or 100000 req/sec)")
+    parser.add_argument("--dataset-sweep", type=parse_int_list, metavar="SIZES",
+                        help="Grow each server's store to these user counts, e.g. 10000,100000,1000000, and measure "
+                             "GET_ALL pages and server memory at each size (replaces the benchmark and stress phases)")
+    parser.add_argument("--dataset-limits", type=parse_int_list, default=[10, 100, 1000], metavar="LIMITS",
+                        help="Page sizes measured at each dataset size; each is read at the first, middle and last offset")
+    parser.add_argument("--dataset-requests", type=int, default=100,
+                        help="GET_ALL requests per page shape and dataset size")
+    parser.add_argument("--dataset-concurrency", type=int, default=10,
+                        help="Concurrent GET_ALL requests while measuring pages")
+    parser.add_argument("--populate-concurrency", type=int, default=256,
+                        help="Concurrent CREATE requests per load generator process while populating")
+    parser.add_argument("--payload-sweep", type=parse_size_list, metavar="SIZES",
+                        help="Create, update and delete users with request bodies of each size, e.g. 100,1k,10k,100k,1m, "
+                             "for --duration seconds per size, reporting req/s and MB/s (replaces the benchmark and stress phases)")
+    parser.add_argument("--payload-fields", type=int, default=0,
+                        help="Extra JSON fields the body size is split across besides name (the servers echo name "
+                             "back but drop other fields)")
+    parser.add_argument("--payload-distribution", choices=PAYLOAD_DISTRIBUTIONS, default="fixed",
+                        help="Body size per request: exactly the sweep size, uniform between 0.5x and 1.5x, "
+                             "or lognormal with the size as median")
+    parser.add_argument("--payload-chunked", action="store_true",
+                        help="Send payload bodies with chunked transfer encoding instead of Content-Length")
+    parser.add_argument("--payload-chunk-size", type=parse_size, default=16 * 1024,
+                        help="Chunk size for --payload-chunked (default 16k)")
+    parser.add_argument("--payload-concurrency", type=int, default=16,
+                        help="Concurrent workers in the payload sweep")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Benchmark the clustered variants (one worker per core, shared users store, ports "
+                             "3011-3018) instead of the single-process servers")
+    parser.add_argument("--workers", type=int,
+                        help="Worker processes for clustered servers launched by --manage-servers "
+                             "(default: one per CPU available to the server)")
+    parser.add_argument("--core-sweep", type=parse_core_counts, nargs="?", const="1,2,4,N", metavar="COUNTS",
+                        help="Launch each clustered server with each worker count (default 1,2,4,N, where N is "
+                             "the number of CPUs), run the stress phase and report speedup and scaling efficiency "
+                             "(replaces the benchmark and stress phases; implies --cluster and --manage-servers)")
+    parser.add_argument("--workload",
+                        help="Drive the stress phase from a workload spec instead of the fixed CRUD loop: a built-in "
+                             "name (read-heavy, write-heavy, read-latest) or a JSON file with mix, key_distribution, "
+                             "zipf_theta, prepopulate and think_time_ms")
+    parser.add_argument("--body-policy", default="",
+                        help="Per-operation response body handling, e.g. CREATE=json,GET_ALL=sample:100 "
+                             "(json, id, drain or sample:N; default: CREATE=id, others drain)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Pin each server and its load generator to disjoint CPUs and run targets "
+                             "concurrently when there are enough CPUs, sequentially otherwise")
+    parser.add_argument("--server-cpus", type=int, default=1,
+                        help="CPUs reserved for each server in --parallel mode (the client gets one per process)")
+    parser.add_argument("--sample-interval", type=float, default=0.5,
+                        help="Seconds between samples of each server's RSS, CPU time, threads and open files "
+                             "during the stress phase")
+    parser.add_argument("--manage-servers", action="store_true",
+                        help="Launch each server from its package.json/deno.json script, warm it up, sample its "
+                             "RSS/CPU during the run and stop it afterwards, so every run starts with an empty store")
+    parser.add_argument("--server-warmup", type=int, default=200,
+                        help="Requests per CRUD operation sent to a launched server before measuring (0 to skip)")
+    parser.add_argument("--startup-timeout", type=float, default=30,
+                        help="Seconds to wait for a launched server's first successful response")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Repeat the benchmark and stress phases up to this many times, in a new random server "
+                             "order each time, until the confidence intervals are narrow enough")
+    parser.add_argument("--min-runs", type=int, default=3, help="Runs per server before convergence is checked")
+    parser.add_argument("--ci-width", type=float, default=0.05,
+                        help="Stop repeating a server once the confidence interval of throughput and P99 for every "
+                             "operation is within this fraction of the mean (0.05 = ±5%%)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--time-budget", type=float, default=0,
+                        help="Stop starting new runs after this many seconds (0 for no limit)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="Significance level a winner must beat its closest rival at")
+    parser.add_argument("--output", help="Write results to this file as JSON (or NDJSON if it ends in .ndjson)")
+
+    subparsers = parser.add_subparsers(dest="command")
+    compare_parser = subparsers.add_parser("compare", help="Compare saved runs and flag significant regressions")
+    compare_parser.add_argument("baseline", nargs="+",
+                                help="Baseline result files; without --against the last file is the candidate")
+    compare_parser.add_argument("--against", nargs="+", metavar="CANDIDATE", help="Candidate result files")
+    compare_parser.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    compare_parser.add_argument("--threshold", type=float, default=0.05,
+                                help="Smallest relative change worth flagging (0.05 = 5%%)")
+
+    args = parser.parse_args()
+    if args.command == "compare" and not args.against:
+        if len(args.baseline) < 2:
+            parser.error("compare needs at least one baseline and one candidate file")
+        args.baseline, args.against = args.baseline[:-1], args.baseline[-1:]
+    sweeps = (args.connection_sweep, args.saturate, args.dataset_sweep, args.payload_sweep, args.core_sweep)
+    if sum(bool(sweep) for sweep in sweeps) > 1:
+        parser.error("only one of --connection-sweep, --saturate, --dataset-sweep, --payload-sweep and --core-sweep "
+                     "can be used at a time")
+    if any(sweeps) and args.parallel:
+        parser.error("sweeps run targets one at a time and cannot be combined with --parallel")
+    if args.runs < 1 or args.min_runs < 2:
+        parser.error("--runs must be at least 1 and --min-runs at least 2")
+    if args.runs > 1 and (any(sweeps) or args.parallel):
+        parser.error("--runs repeats the benchmark and stress phases and cannot be combined with sweeps or --parallel")
+    if not 0 < args.confidence < 1 or args.ci_width <= 0:
+        parser.error("--confidence must be between 0 and 1 and --ci-width positive")
+    if args.saturate == "rate" and args.workload:
+        parser.error("--workload drives a closed loop; use --saturate concurrency")
+    if args.ramp_factor <= 1:
+        parser.error("--ramp-factor must be greater than 1")
+    if args.ramp_start is None:
+        args.ramp_start = 500 if args.saturate == "rate" else 1
+    if args.ramp_max is None:
+        args.ramp_max = 100_000 if args.saturate == "rate" else 4096
+    if args.ramp_max < args.ramp_start:
+        parser.error("--ramp-max must not be below --ramp-start")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.core_sweep:
+        args.cluster = True
+        args.manage_servers = True
+    if args.pipeline < 1:
+        parser.error("--pipeline must be at least 1")
+    if args.pipeline > 1 and args.engine != "raw":
+        parser.error("--pipeline needs --engine raw; aiohttp does not pipeline requests")
+    if args.pipeline > 1 and args.no_keep_alive:
+        parser.error("--pipeline needs keep-alive connections")
+    args.connection_pool = {
+        "engine": args.engine,
+        "pipeline": args.pipeline,
+        "limit": args.pool_limit,
+        "limit_per_host": args.pool_limit_per_host,
+        "keep_alive": not args.no_keep_alive,
+        "dns_cache": not args.no_dns_cache,
+        "trace_phases": args.trace_phases,
+    }
+    try:
+        args.body_policy = parse_body_policy(args.body_policy)
+        configure_body_policy(args.body_policy)
+        args.workload = load_workload(args.workload) if args.workload else None
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.command == "compare":
+        sys.exit(compare_files(args.baseline, args.against, args.alpha, args.threshold))
+    asyncio.run(main(args))
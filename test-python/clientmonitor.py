@@ -0,0 +1,158 @@
+import asyncio
+import time
+from contextlib import suppress
+from typing import Dict, List, Optional
+import aiohttp
+from metrics import LatencyHistogram
+
+# Phases a traced request is split into, in order
+PHASES = ("queue", "connect", "send", "ttfb", "body")
+
+
+def mark(marks: Optional[Dict], name: str):
+    """Record when a request reached a point, if it is being traced"""
+    if marks is not None:
+        marks[name] = time.perf_counter()
+
+
+def phase_durations(marks: Optional[Dict], end: float) -> Optional[Dict[str, float]]:
+    """Split a traced request into phases (seconds) from its marks and the time its body was fully read.
+
+      queue    waiting for the pool to hand out a connection
+      connect  opening a new connection (0 when one was reused)
+      send     writing the request line, headers and body
+      ttfb     from the request being sent to the response headers arriving
+      body     reading and decoding the response body
+
+    Returns None for untraced requests or ones that never got a response.
+    """
+    if not marks or "start" not in marks or "response" not in marks:
+        return None
+    start = marks["start"]
+    queue = marks.get("queued_end", start) - marks.get("queued_start", start)
+    connect = marks.get("connect_end", start) - marks.get("connect_start", start)
+    ready = max(start, marks.get("queued_end", start), marks.get("connect_end", start))
+    sent = max(ready, marks.get("headers_sent", ready), marks.get("sent", ready))
+    return {
+        "queue": queue,
+        "connect": connect,
+        "send": sent - ready,
+        "ttfb": marks["response"] - sent,
+        "body": end - marks["response"],
+    }
+
+
+def phase_trace_config() -> aiohttp.TraceConfig:
+    """Trace hooks that mark each phase of a request whose trace_request_ctx is a marks dict"""
+    trace_config = aiohttp.TraceConfig()
+
+    def hook(name: str):
+        async def on_signal(session, context, params):
+            mark(context.trace_request_ctx, name)
+        return on_signal
+
+    trace_config.on_request_start.append(hook("start"))
+    trace_config.on_connection_queued_start.append(hook("queued_start"))
+    trace_config.on_connection_queued_end.append(hook("queued_end"))
+    trace_config.on_connection_create_start.append(hook("connect_start"))
+    trace_config.on_connection_create_end.append(hook("connect_end"))
+    trace_config.on_request_headers_sent.append(hook("headers_sent"))
+    trace_config.on_request_chunk_sent.append(hook("sent"))
+    # Fired once the response status line and headers have been read
+    trace_config.on_request_end.append(hook("response"))
+    return trace_config
+
+
+class ClientMonitor:
+    """Event-loop lag and CPU use of one load generator process.
+
+    A probe asks to wake every `interval` seconds and records how late it
+    actually wakes. That delay is how long any ready callback (a response
+    arriving, a worker about to send) waits for the loop, and it is included
+    in every request duration measured on that loop.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lag = LatencyHistogram()
+        self._task: Optional[asyncio.Task] = None
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+
+    async def _probe(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.record(max(0.0, time.perf_counter() - expected) * 1000)
+
+    def start(self):
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        self._task = asyncio.create_task(self._probe())
+
+    async def stop(self) -> Dict:
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        return self.summary()
+
+    def summary(self) -> Dict:
+        elapsed = time.perf_counter() - self._wall_start
+        cpu_seconds = time.process_time() - self._cpu_start
+        return {
+            "elapsed": elapsed,
+            "cpu_seconds": cpu_seconds,
+            "cpu_percent": cpu_seconds / elapsed * 100 if elapsed > 0 else 0,
+            "lag": self.lag,
+        }
+
+
+async def run_monitored(run, on_start=None) -> tuple:
+    """Await run(started) while monitoring the running loop; returns (its result, the monitor summary).
+
+    Monitoring begins when run calls started, once it is past any start
+    barrier, so waiting for other load generator processes to spawn is not
+    counted as idle client time. on_start, if given, is called then too.
+    """
+    monitor = ClientMonitor()
+
+    def started():
+        monitor.start()
+        if on_start:
+            on_start()
+
+    try:
+        result = await run(started)
+    finally:
+        summary = await monitor.stop()
+    return result, summary
+
+
+def combine_client_stats(summaries: List[Dict]) -> Dict:
+    """Fold the monitor summaries of every load generator process into plain numbers.
+
+    Each process runs a single event loop, so the busiest one is what limits the client.
+    """
+    lag = LatencyHistogram()
+    for summary in summaries:
+        lag.merge(summary["lag"])
+    return {
+        "processes": len(summaries),
+        "cpu_seconds": sum(summary["cpu_seconds"] for summary in summaries),
+        "cpu_percent_max": max(summary["cpu_percent"] for summary in summaries),
+        "lag_mean_ms": lag.mean,
+        "lag_p99_ms": lag.percentile(99),
+        "lag_max_ms": lag.max,
+    }
+
+
+def client_bottlenecks(client: Dict, max_cpu_percent: float, max_lag_ms: float) -> List[str]:
+    """Reasons to believe the load generator, not the server, limited a run (empty if none)"""
+    reasons = []
+    if client["cpu_percent_max"] >= max_cpu_percent:
+        reasons.append(f"a load generator process used {client['cpu_percent_max']:.0f}% of a CPU")
+    if client["lag_p99_ms"] >= max_lag_ms:
+        reasons.append(f"event-loop lag p99 was {client['lag_p99_ms']:.1f} ms")
+    return reasons
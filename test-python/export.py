@@ -0,0 +1,133 @@
+import base64
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from metrics import LatencyHistogram
+
+RUNTIME_VERSION_COMMANDS = {
+    "Node.js": ["node", "--version"],
+    "Deno": ["deno", "--version"],
+    "Bun": ["bun", "--version"],
+}
+
+
+def split_server_name(server_name: str) -> Tuple[str, str]:
+    """Split "Node.js (native)" into ("Node.js", "native")"""
+    runtime, _, framework = server_name.partition(" (")
+    return runtime, framework.rstrip(")")
+
+
+def _command_output(command: List[str], cwd: Optional[str] = None) -> Optional[str]:
+    if not shutil.which(command[0]):
+        return None
+    try:
+        output = subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.splitlines()[0] if output else None
+
+
+def runtime_version(runtime: str) -> Optional[str]:
+    """Version string reported by a runtime's CLI, or None if it is not installed"""
+    command = RUNTIME_VERSION_COMMANDS.get(runtime)
+    return _command_output(command) if command else None
+
+
+def git_revision() -> Optional[str]:
+    """Commit of the checkout the benchmark runs from, marked -dirty when it has local changes"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    revision = _command_output(["git", "rev-parse", "HEAD"], cwd=here)
+    if revision and _command_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here):
+        revision += "-dirty"
+    return revision
+
+
+def collect_metadata(server_names: Iterable[str]) -> Dict:
+    """Describe the environment a run was produced in"""
+    runtimes = sorted({split_server_name(name)[0] for name in server_names})
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "host": {
+            "hostname": socket.gethostname(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "runtimes": {runtime: runtime_version(runtime) for runtime in runtimes},
+    }
+
+
+def _record(url: str, server_name: str, phase: str, operation: str, stats: Dict) -> Dict:
+    runtime, framework = split_server_name(server_name)
+    stats = dict(stats)
+    histogram = stats.pop("histogram", None)
+    return {
+        "server": server_name,
+        "url": url,
+        "runtime": runtime,
+        "framework": framework,
+        "phase": phase,
+        "operation": operation,
+        "stats": stats,
+        "histogram": base64.b64encode(histogram.to_bytes()).decode("ascii") if histogram else None,
+    }
+
+
+def build_records(benchmark_results: Dict, stress_results: Dict, server_names: Dict[str, str],
+                  server_results: Optional[Dict] = None, sweeps: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """Flatten per-server results into one record per server, phase and operation.
+
+    sweeps maps a sweep's name to {url: {point: stats}}; each point becomes a
+    record whose phase is the sweep name and whose operation is the point.
+    """
+    records = []
+    for url, operation_stats in benchmark_results.items():
+        for operation, stats in (operation_stats or {}).items():
+            records.append(_record(url, server_names.get(url, url), "benchmark", operation, stats))
+    for url, stats in stress_results.items():
+        if stats:
+            records.append(_record(url, server_names.get(url, url), "stress", "ALL", stats))
+    for url, stats in (server_results or {}).items():
+        if stats:
+            records.append(_record(url, server_names.get(url, url), "server", "PROCESS", stats))
+    for sweep, sweep_results in (sweeps or {}).items():
+        for url, points in sweep_results.items():
+            for point, stats in points.items():
+                if stats:
+                    records.append(_record(url, server_names.get(url, url), sweep, str(point), stats))
+    return records
+
+
+def write_results(path: str, metadata: Dict, records: List[Dict]):
+    """Write a run as JSON, or as NDJSON (metadata line first) when the path ends in .ndjson"""
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".ndjson"):
+            f.write(json.dumps({"type": "metadata", **metadata}) + "\n")
+            for record in records:
+                f.write(json.dumps({"type": "result", **record}) + "\n")
+        else:
+            json.dump({"metadata": metadata, "results": records}, f, indent=2)
+
+
+def load_results(path: str) -> Tuple[Dict, List[Dict]]:
+    """Load a run written by write_results, decoding its histograms"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".ndjson"):
+            lines = [json.loads(line) for line in f if line.strip()]
+            metadata = next((line for line in lines if line.get("type") == "metadata"), {})
+            records = [line for line in lines if line.get("type") == "result"]
+        else:
+            data = json.load(f)
+            metadata, records = data["metadata"], data["results"]
+
+    for record in records:
+        if record.get("histogram"):
+            record["histogram"] = LatencyHistogram.from_bytes(base64.b64decode(record["histogram"]))
+    return metadata, records
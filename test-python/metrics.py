@@ -0,0 +1,306 @@
+import math
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+
+class LatencyHistogram:
+    """Fixed-memory, log-bucketed latency histogram.
+
+    Values are recorded in milliseconds. Bucket boundaries grow geometrically,
+    so every recorded value is represented within `precision` relative error
+    and memory stays constant no matter how many values are recorded.
+    Count, sum, min and max are tracked exactly.
+    """
+
+    _HEADER = struct.Struct("<dddQddddI")
+
+    def __init__(self, min_value: float = 0.001, max_value: float = 600_000.0, precision: float = 0.01):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.bucket_count = self._index(max_value) + 1
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return math.ceil(math.log(value / self.min_value) / self._log_base)
+
+    def _bucket_value(self, index: int) -> float:
+        """Geometric midpoint of a bucket"""
+        if index == 0:
+            return self.min_value
+        return self.min_value * math.exp((index - 0.5) * self._log_base)
+
+    def record(self, value: float, count: int = 1):
+        """Record a value in ms"""
+        index = min(self._index(value), self.bucket_count - 1)
+        self.counts[index] += count
+        self.count += count
+        self.total += value * count
+        self.total_squares += value * value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram with the same layout into this one"""
+        if (other.min_value, other.max_value, other.precision) != (self.min_value, self.max_value, self.precision):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, percentile: float) -> float:
+        """Value at the given percentile (0-100), accurate to the bucket precision"""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation"""
+        if self.count < 2:
+            return 0
+        variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0))
+
+    def summary(self) -> Dict:
+        """Summary statistics in ms"""
+        return {
+            "mean": self.mean,
+            "median": self.percentile(50),
+            "min": self.min if self.count else 0,
+            "max": self.max,
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "stdev": self.stdev,
+        }
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly form with only the non-empty buckets"""
+        return {
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "precision": self.precision,
+            "count": self.count,
+            "total": self.total,
+            "total_squares": self.total_squares,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": {str(index): c for index, c in enumerate(self.counts) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls(data["min_value"], data["max_value"], data["precision"])
+        for index, bucket_count in data["buckets"].items():
+            histogram.counts[int(index)] = bucket_count
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.total_squares = data["total_squares"]
+        histogram.min = math.inf if data["min"] is None else data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form: a fixed header followed by zlib-compressed (index, count) pairs"""
+        pairs = [(index, c) for index, c in enumerate(self.counts) if c]
+        body = b"".join(struct.pack("<IQ", index, c) for index, c in pairs)
+        header = self._HEADER.pack(
+            self.min_value, self.max_value, self.precision, self.count,
+            self.total, self.total_squares, self.min, self.max, len(pairs),
+        )
+        return zlib.compress(header + body)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "LatencyHistogram":
+        raw = zlib.decompress(payload)
+        (min_value, max_value, precision, count, total, total_squares,
+         minimum, maximum, pair_count) = cls._HEADER.unpack_from(raw)
+        histogram = cls(min_value, max_value, precision)
+        for index, bucket_count in struct.iter_unpack("<IQ", raw[cls._HEADER.size:cls._HEADER.size + pair_count * 12]):
+            histogram.counts[index] = bucket_count
+        histogram.count = count
+        histogram.total = total
+        histogram.total_squares = total_squares
+        histogram.min = minimum
+        histogram.max = maximum
+        return histogram
+
+
+class OperationRecorder:
+    """Bounded-memory record of one operation's request outcomes.
+
+    Results carrying "phases" (seconds per request phase, from a traced
+    request) also get a histogram per phase.
+    """
+
+    def __init__(self, precision: float = 0.01):
+        self.total = 0
+        self.failed = 0
+        self.bytes_received = 0
+        self.histogram = LatencyHistogram(precision=precision)
+        self.phases: Dict[str, LatencyHistogram] = {}
+
+    @property
+    def successful(self) -> int:
+        return self.histogram.count
+
+    def record(self, result: Dict, duration: Optional[float] = None):
+        """Record a request result; duration (in seconds) defaults to result["duration"]"""
+        self.total += 1
+        self.bytes_received += result.get("bytes", 0)
+        if result["success"]:
+            self.histogram.record((result["duration"] if duration is None else duration) * 1000)
+            for phase, seconds in (result.get("phases") or {}).items():
+                if phase not in self.phases:
+                    self.phases[phase] = LatencyHistogram(precision=self.histogram.precision)
+                self.phases[phase].record(seconds * 1000)
+        else:
+            self.failed += 1
+
+    def merge(self, other: "OperationRecorder") -> "OperationRecorder":
+        self.total += other.total
+        self.failed += other.failed
+        self.bytes_received += other.bytes_received
+        self.histogram.merge(other.histogram)
+        for phase, histogram in other.phases.items():
+            if phase not in self.phases:
+                self.phases[phase] = LatencyHistogram(histogram.min_value, histogram.max_value, histogram.precision)
+            self.phases[phase].merge(histogram)
+        return self
+
+    def phase_summary(self) -> Dict[str, Dict]:
+        """Mean, median and P99 of each traced phase in ms"""
+        return {
+            phase: {"mean": histogram.mean, "median": histogram.percentile(50), "p99": histogram.percentile(99)}
+            for phase, histogram in self.phases.items()
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "total": self.total,
+            "failed": self.failed,
+            "bytes_received": self.bytes_received,
+            "histogram": self.histogram.to_dict(),
+            "phases": {phase: histogram.to_dict() for phase, histogram in self.phases.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OperationRecorder":
+        recorder = cls()
+        recorder.total = data["total"]
+        recorder.failed = data["failed"]
+        recorder.bytes_received = data.get("bytes_received", 0)
+        recorder.histogram = LatencyHistogram.from_dict(data["histogram"])
+        recorder.phases = {phase: LatencyHistogram.from_dict(histogram) for phase, histogram in data.get("phases", {}).items()}
+        return recorder
+
+
+def record_result(recorders: Dict[str, OperationRecorder], result: Dict, precision: float = 0.01):
+    """Record a result under its operation, creating the recorder on first use"""
+    recorder = recorders.get(result["operation"])
+    if recorder is None:
+        recorder = recorders[result["operation"]] = OperationRecorder(precision)
+    recorder.record(result)
+
+
+def merge_recorders(*recorder_maps: Dict[str, OperationRecorder]) -> Dict[str, OperationRecorder]:
+    """Merge per-operation recorders from several sources into new recorders"""
+    merged = {}
+    for recorders in recorder_maps:
+        for operation, recorder in recorders.items():
+            if operation not in merged:
+                merged[operation] = OperationRecorder(recorder.histogram.precision)
+            merged[operation].merge(recorder)
+    return merged
+
+
+def combine(recorders: Iterable[OperationRecorder], precision: float = 0.01) -> OperationRecorder:
+    """Fold several recorders into a single overall recorder"""
+    overall = OperationRecorder(precision)
+    for recorder in recorders:
+        overall.merge(recorder)
+    return overall
+
+
+class IntervalSeries:
+    """Per-operation recorders bucketed into fixed time intervals.
+
+    Results are assigned to the interval in which they complete. Interval
+    histograms use a coarser precision than whole-run ones to keep a long
+    series small.
+    """
+
+    def __init__(self, start: float, interval: float = 1.0, precision: float = 0.05):
+        self.start = start
+        self.interval = interval
+        self.precision = precision
+        self.intervals: Dict[int, Dict[str, OperationRecorder]] = {}
+
+    @property
+    def last_index(self) -> int:
+        return max(self.intervals, default=-1)
+
+    def interval_end(self, index: int) -> float:
+        return self.start + (index + 1) * self.interval
+
+    def record(self, result: Dict, at: float):
+        index = int((at - self.start) // self.interval)
+        record_result(self.intervals.setdefault(index, {}), result, self.precision)
+
+    def get(self, index: int) -> Dict[str, OperationRecorder]:
+        return self.intervals.get(index, {})
+
+    def merge(self, other: "IntervalSeries") -> "IntervalSeries":
+        """Merge another series recorded with the same interval length, aligning by index"""
+        for index, recorders in other.intervals.items():
+            self.intervals[index] = merge_recorders(self.get(index), recorders)
+        return self
+
+    def summarize(self, index: int) -> Dict:
+        """Throughput, errors and p50/p99 per operation for one interval"""
+        recorders = self.get(index)
+        overall = combine(recorders.values(), self.precision)
+        return {
+            "t": index * self.interval,
+            "req_per_sec": overall.successful / self.interval,
+            "errors": overall.failed,
+            "operations": {
+                operation: {
+                    "count": recorder.successful,
+                    "errors": recorder.failed,
+                    "p50": recorder.histogram.percentile(50),
+                    "p99": recorder.histogram.percentile(99),
+                }
+                for operation, recorder in recorders.items()
+            },
+        }
+
+    def to_list(self) -> List[Dict]:
+        return [self.summarize(index) for index in range(self.last_index + 1)]
@@ -0,0 +1,81 @@
+import math
+import random
+from typing import AsyncIterator, List, Optional
+
+PAYLOAD_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2}
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte size such as 100, 10k or 1MB"""
+    text = text.strip().lower()
+    number = text.rstrip("kmb")
+    unit = text[len(number):]
+    if unit not in _SIZE_UNITS or not number:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def format_size(size: float) -> str:
+    for unit, scale in (("MB", 1024 ** 2), ("KB", 1024)):
+        if size >= scale:
+            return f"{size / scale:g}{unit}"
+    return f"{size:g}B"
+
+
+class PayloadGenerator:
+    """JSON bodies of a target size for CREATE and UPDATE.
+
+    The size is split evenly between the name field, which the servers store
+    and echo back (so responses grow too), and `extra_fields` additional
+    fields, which the servers parse and then drop. Each body's size is drawn
+    from the distribution around the target:
+
+      fixed      always the target size
+      uniform    between half and one and a half times the target
+      lognormal  median at the target with a long tail, capped at four times it
+    """
+
+    def __init__(self, size: int, extra_fields: int = 0, distribution: str = "fixed",
+                 rng: Optional[random.Random] = None):
+        if distribution not in PAYLOAD_DISTRIBUTIONS:
+            raise ValueError(f"Unknown payload distribution: {distribution}")
+        self.size = size
+        self.extra_fields = extra_fields
+        self.distribution = distribution
+        self.rng = rng or random.Random()
+        self._padding = b"x" * (size * 4)
+
+    def _draw_size(self) -> int:
+        if self.distribution == "uniform":
+            return int(self.rng.uniform(0.5, 1.5) * self.size)
+        if self.distribution == "lognormal":
+            return min(int(self.size * math.exp(self.rng.gauss(0, 1))), self.size * 4)
+        return self.size
+
+    def _build(self, user_id: int, pad: bytes) -> bytes:
+        extra = b"".join(b', "field%d": "%s"' % (i, pad) for i in range(self.extra_fields))
+        return b'{"name": "User %d %s", "email": "user%d@example.com"%s}' % (user_id, pad, user_id, extra)
+
+    def body(self, user_id: int) -> bytes:
+        """A JSON body of the drawn size, or just the bare fields if they are already larger"""
+        bare = len(self._build(user_id, b""))
+        padding = max(0, self._draw_size() - bare) // (self.extra_fields + 1)
+        return self._build(user_id, self._padding[:padding])
+
+
+def iter_chunks(body: bytes, chunk_size: int) -> List[bytes]:
+    return [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+
+
+def chunked_encoding(body: bytes, chunk_size: int) -> bytes:
+    """The body framed with HTTP/1.1 chunked transfer encoding"""
+    framed = b"".join(b"%x\r\n%s\r\n" % (len(chunk), chunk) for chunk in iter_chunks(body, chunk_size) if chunk)
+    return framed + b"0\r\n\r\n"
+
+
+async def async_chunks(body: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yield the body in pieces; aiohttp sends an async iterable with chunked transfer encoding"""
+    for chunk in iter_chunks(body, chunk_size):
+        yield chunk
@@ -0,0 +1,251 @@
+import asyncio
+import os
+import time
+from contextlib import suppress
+from typing import Dict, Iterable, List, Optional
+
+# State code of a listening socket in /proc/net/tcp
+_TCP_LISTEN = "0A"
+
+
+def _listening_inodes(port: int) -> set:
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    local_port = int(fields[1].rsplit(":", 1)[1], 16)
+                    if local_port == port and fields[3] == _TCP_LISTEN:
+                        inodes.add(fields[9])
+        except OSError:
+            continue
+    return inodes
+
+
+def _listening_sockets(port: int) -> set:
+    return {f"socket:[{inode}]" for inode in _listening_inodes(port)}
+
+
+def _holds_socket(pid: int, sockets: set) -> bool:
+    try:
+        return any(os.readlink(f"/proc/{pid}/fd/{fd}") in sockets for fd in os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return False
+
+
+def find_listening_pid(port: int) -> Optional[int]:
+    """PID of the process listening on a TCP port, or None if it cannot be found"""
+    sockets = _listening_sockets(port)
+    if not sockets:
+        return None
+    for entry in os.listdir("/proc"):
+        if entry.isdigit() and _holds_socket(int(entry), sockets):
+            return int(entry)
+    return None
+
+
+def _parent_pid(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return int(f.read().rsplit(")", 1)[1].split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _executable(pid: int) -> Optional[str]:
+    try:
+        return os.readlink(f"/proc/{pid}/exe")
+    except OSError:
+        return None
+
+
+def _arguments(pid: int) -> List[str]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().decode(errors="replace").split("\0")
+    except OSError:
+        return []
+
+
+def _is_cluster_primary(pid: int, executable: str) -> bool:
+    """Whether pid is a cluster.js primary running the same runtime as its workers"""
+    return (_executable(pid) == executable
+            and any(os.path.basename(argument) == "cluster.js" for argument in _arguments(pid)[1:]))
+
+
+def server_root(pid: int, port: int) -> int:
+    """The top of a multi-process server containing pid, the process listening on port.
+
+    With reusePort the listening socket belongs to a cluster worker, so walk up
+    to its parent while that parent also listens on the port or is the
+    cluster.js primary. Launchers running the same binary (`deno task`) are
+    neither, so they are not counted as part of the server.
+    """
+    executable = _executable(pid)
+    sockets = _listening_sockets(port)
+    while executable:
+        parent = _parent_pid(pid)
+        if not parent or parent == 1:
+            break
+        if not (_holds_socket(parent, sockets) or _is_cluster_primary(parent, executable)):
+            break
+        pid = parent
+    return pid
+
+
+def find_server_pid(port: int) -> Optional[int]:
+    """PID of the server (the primary, for a clustered one) listening on a TCP port"""
+    pid = find_listening_pid(port)
+    return server_root(pid, port) if pid else None
+
+
+def process_tree(pid: int) -> List[int]:
+    """pid followed by all of its descendants"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            parent = _parent_pid(int(entry))
+            if parent:
+                children.setdefault(parent, []).append(int(entry))
+    tree = [pid]
+    for member in tree:
+        tree.extend(children.get(member, []))
+    return tree
+
+
+def thread_ids(pid: int) -> List[int]:
+    try:
+        return [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+    except OSError:
+        return []
+
+
+def pin_process(pid: int, cpus: Iterable[int]) -> bool:
+    """Restrict every thread of a process to the given CPUs.
+
+    sched_setaffinity only applies to a single thread, so runtimes that have
+    already started worker threads need each one pinned.
+    """
+    cpus = set(cpus)
+    pinned = False
+    for tid in thread_ids(pid) or [pid]:
+        try:
+            os.sched_setaffinity(tid, cpus)
+            pinned = True
+        except OSError:
+            continue
+    return pinned
+
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def read_process_stats(pid: int) -> Optional[Dict]:
+    """Current RSS (bytes), total CPU time (seconds), thread count and open file descriptors of a process.
+
+    Returns None if the process has exited. The descriptor count is None when
+    /proc/<pid>/fd is not readable (another user's process).
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces, so split after its closing parenthesis
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as f:
+            rss_kb = next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), 0)
+    except (OSError, IndexError, ValueError):
+        return None
+    try:
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        fds = None
+    return {
+        "rss_bytes": rss_kb * 1024,
+        "cpu_seconds": (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS,
+        "threads": int(fields[17]),
+        "fds": fds,
+    }
+
+
+def read_tree_stats(pid: int) -> Optional[Dict]:
+    """read_process_stats summed over a process and its descendants, such as a clustered server's workers.
+
+    CPU time only counts live processes, so a worker that exits takes its CPU time with it.
+    """
+    members = [read_process_stats(member) for member in process_tree(pid)]
+    if members[0] is None:
+        return None
+    members = [stats for stats in members if stats]
+    fds = [stats["fds"] for stats in members]
+    return {
+        "rss_bytes": sum(stats["rss_bytes"] for stats in members),
+        "cpu_seconds": sum(stats["cpu_seconds"] for stats in members),
+        "threads": sum(stats["threads"] for stats in members),
+        "fds": None if None in fds else sum(fds),
+        "processes": len(members),
+    }
+
+
+class ProcessSampler:
+    """Sample a process's RSS, CPU time, threads and file descriptors from /proc at a fixed interval.
+
+    Child processes are included, so a clustered server is measured as a whole.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample(self):
+        stats = read_tree_stats(self.pid)
+        if stats:
+            stats["time"] = time.perf_counter()
+            self.samples.append(stats)
+
+    async def _run(self):
+        while True:
+            self._sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict:
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._sample()
+        return self.summary()
+
+    def summary(self) -> Dict:
+        """Resource usage over the sampled window.
+
+        Steady RSS is the median of the second half of the samples, after the
+        heap has had time to grow to its working size.
+        """
+        if len(self.samples) < 2:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        elapsed = last["time"] - first["time"]
+        cpu_seconds = last["cpu_seconds"] - first["cpu_seconds"]
+        rss = [sample["rss_bytes"] / 1024 / 1024 for sample in self.samples]
+        steady = sorted(rss[len(rss) // 2:])
+        fds = [sample["fds"] for sample in self.samples if sample["fds"] is not None]
+        return {
+            "samples": len(self.samples),
+            "elapsed": elapsed,
+            "rss_peak_mb": max(rss),
+            "rss_mean_mb": sum(rss) / len(rss),
+            "rss_steady_mb": steady[len(steady) // 2],
+            "cpu_seconds": cpu_seconds,
+            "cpu_percent": cpu_seconds / elapsed * 100 if elapsed > 0 else 0,
+            "threads_peak": max(sample["threads"] for sample in self.samples),
+            "fds_peak": max(fds) if fds else None,
+            "processes_peak": max(sample["processes"] for sample in self.samples),
+        }
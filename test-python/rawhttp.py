@@ -0,0 +1,318 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from clientmonitor import mark
+from payload import chunked_encoding
+
+# Seconds a request may take end to end, matching aiohttp's default total timeout
+DEFAULT_TIMEOUT = 300
+
+
+class RequestTemplates:
+    """Pre-serialised HTTP/1.1 requests for each CRUD operation against one server.
+
+    Everything but the user ID and body length is encoded once, so building a
+    request is a few bytes operations rather than a header dict and a JSON dump.
+    Bodies match what aiohttp's json= sends.
+    """
+
+    def __init__(self, host: str, keep_alive: bool = True):
+        common = f"Host: {host}\r\n" + ("" if keep_alive else "Connection: close\r\n")
+        self._get_all = f"GET /users HTTP/1.1\r\n{common}\r\n".encode()
+        self._get_page = f"GET /users?limit=%d&offset=%d HTTP/1.1\r\n{common}\r\n".encode()
+        self._get_one = f"GET /users/%d HTTP/1.1\r\n{common}\r\n".encode()
+        self._delete = f"DELETE /users/%d HTTP/1.1\r\n{common}\r\n".encode()
+        json_headers = f"{common}Content-Type: application/json\r\nContent-Length: %d\r\n\r\n"
+        self._create = f"POST /users HTTP/1.1\r\n{json_headers}".encode()
+        self._update = f"PUT /users/%d HTTP/1.1\r\n{json_headers}".encode()
+        chunked_headers = f"{common}Content-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n"
+        self._create_chunked = f"POST /users HTTP/1.1\r\n{chunked_headers}".encode()
+        self._update_chunked = f"PUT /users/%d HTTP/1.1\r\n{chunked_headers}".encode()
+
+    def create(self, user_id: int) -> bytes:
+        body = b'{"name": "User %d", "email": "user%d@example.com"}' % (user_id, user_id)
+        return self._create % len(body) + body
+
+    def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> bytes:
+        if limit is None and offset is None:
+            return self._get_all
+        # The servers default to limit 100 and offset 0
+        return self._get_page % (100 if limit is None else limit, offset or 0)
+
+    def get_one(self, user_id: int) -> bytes:
+        return self._get_one % user_id
+
+    def update(self, user_id: int) -> bytes:
+        body = b'{"name": "Updated User %d"}' % user_id
+        return self._update % (user_id, len(body)) + body
+
+    def delete(self, user_id: int) -> bytes:
+        return self._delete % user_id
+
+    def payload(self, operation: str, user_id: Optional[int], body: bytes, chunk_size: Optional[int] = None) -> bytes:
+        """CREATE or UPDATE with a prepared body, framed with chunked transfer encoding when chunk_size is given"""
+        if chunk_size:
+            head = self._create_chunked if operation == "CREATE" else self._update_chunked % user_id
+            return head + chunked_encoding(body, chunk_size)
+        head = self._create % len(body) if operation == "CREATE" else self._update % (user_id, len(body))
+        return head + body
+
+
+class RawConnection(asyncio.Protocol):
+    """One HTTP/1.1 connection that can have several requests in flight (pipelining).
+
+    Responses arrive in request order, so each one resolves the oldest
+    pending future. The parser only understands what the benchmark needs:
+    the status line, Content-Length or chunked bodies, and Connection: close.
+    A request sent with a marks dict gets its "sent" and "response" times marked.
+    """
+
+    def __init__(self, on_idle):
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending = deque()
+        self.closed = False
+        self._on_idle = on_idle
+        self._buffer = bytearray()
+        self._reset()
+
+    def _reset(self):
+        self._status = None
+        self._remaining = None
+        self._chunked = False
+        self._close_after = False
+        self._body = None
+        self._received = 0
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.closed = True
+        error = ConnectionError(f"Connection lost: {exc}" if exc else "Connection closed by server")
+        while self.pending:
+            future, _, _ = self.pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+        self._on_idle(self)
+
+    def send(self, request: bytes, keep_body: bool, marks: Optional[Dict] = None) -> asyncio.Future:
+        """Write a request and return a future for (status, body or None, body bytes received)"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((future, keep_body, marks))
+        self.transport.write(request)
+        mark(marks, "sent")
+        return future
+
+    def close(self):
+        if self.transport and not self.closed:
+            # Mark it closed now so the pool never hands it out while the close is in progress
+            self.closed = True
+            self.transport.close()
+
+    def data_received(self, data: bytes):
+        self._buffer += data
+        try:
+            while self._parse():
+                pass
+        except (ValueError, IndexError) as e:
+            self.connection_lost(ValueError(f"Malformed response: {e}"))
+            self.close()
+
+    def _take_body(self, size: int):
+        if self._body is not None:
+            self._body += self._buffer[:size]
+        del self._buffer[:size]
+        self._received += size
+
+    def _parse(self) -> bool:
+        """Consume as much of the buffer as possible; return True to be called again"""
+        if self._status is None:
+            end = self._buffer.find(b"\r\n\r\n")
+            if end < 0:
+                return False
+            head = bytes(self._buffer[:end]).split(b"\r\n")
+            del self._buffer[:end + 4]
+            # "HTTP/1.1 200 OK"
+            self._status = int(head[0][9:12])
+            self._close_after = head[0].startswith(b"HTTP/1.0")
+            self._remaining = 0
+            for line in head[1:]:
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    self._remaining = int(value)
+                elif name == b"transfer-encoding" and b"chunked" in value.lower():
+                    self._chunked = True
+                    self._remaining = None
+                elif name == b"connection":
+                    self._close_after = value.strip().lower() == b"close"
+            _, keep_body, marks = self.pending[0] if self.pending else (None, False, None)
+            self._body = bytearray() if keep_body else None
+            mark(marks, "response")
+
+        if self._chunked:
+            if self._remaining is None:
+                # Waiting for a chunk-size line
+                end = self._buffer.find(b"\r\n")
+                if end < 0:
+                    return False
+                size = int(bytes(self._buffer[:end]).split(b";")[0], 16)
+                del self._buffer[:end + 2]
+                if size == 0:
+                    self._remaining = -1
+                else:
+                    self._remaining = size + 2  # The chunk and its trailing CRLF
+            if self._remaining == -1:
+                # Last chunk: skip any trailers up to the blank line
+                end = self._buffer.find(b"\r\n")
+                if end < 0:
+                    return False
+                del self._buffer[:end + 2]
+                if end:
+                    return True
+            else:
+                take = min(self._remaining, len(self._buffer))
+                data_take = min(take, max(0, self._remaining - 2))
+                self._take_body(data_take)
+                del self._buffer[:take - data_take]
+                self._remaining -= take
+                if self._remaining:
+                    return False
+                self._remaining = None
+                return True
+        else:
+            take = min(self._remaining, len(self._buffer))
+            self._take_body(take)
+            self._remaining -= take
+            if self._remaining:
+                return False
+
+        self._finish()
+        return bool(self._buffer)
+
+    def _finish(self):
+        future, _, _ = self.pending.popleft()
+        if not future.done():
+            future.set_result((self._status, bytes(self._body) if self._body is not None else None, self._received))
+        close = self._close_after
+        self._reset()
+        if close:
+            self.close()
+        self._on_idle(self)
+
+
+class _OriginPool:
+    """Connections to one host and port, each allowed up to `depth` outstanding requests"""
+
+    def __init__(self, host: str, port: int, limit: int, depth: int):
+        self.host = host
+        self.port = port
+        self.limit = limit
+        self.depth = depth
+        self.connections: List[RawConnection] = []
+        self.opening = 0
+        self.waiters = deque()
+
+    def _wake(self, connection: RawConnection):
+        if connection.closed and connection in self.connections:
+            self.connections.remove(connection)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def acquire(self, marks: Optional[Dict] = None) -> RawConnection:
+        """An idle connection, else a new one while under the limit, else the least busy one with room to pipeline"""
+        while True:
+            open_connections = [c for c in self.connections if not c.closed]
+            idle = next((c for c in open_connections if not c.pending), None)
+            if idle:
+                return idle
+            if not self.limit or len(open_connections) + self.opening < self.limit:
+                self.opening += 1
+                mark(marks, "connect_start")
+                try:
+                    _, connection = await asyncio.get_running_loop().create_connection(
+                        lambda: RawConnection(self._wake), self.host, self.port
+                    )
+                finally:
+                    self.opening -= 1
+                mark(marks, "connect_end")
+                self.connections.append(connection)
+                return connection
+            busy = [c for c in open_connections if len(c.pending) < self.depth]
+            if busy:
+                return min(busy, key=lambda c: len(c.pending))
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            if marks is not None:
+                marks.setdefault("queued_start", time.perf_counter())
+            await waiter
+            mark(marks, "queued_end")
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+        self.connections.clear()
+
+
+class RawSession:
+    """A minimal HTTP/1.1 client over asyncio Protocols, used in place of aiohttp.ClientSession.
+
+    limit caps the connections per server (0 for unlimited) and depth is how
+    many requests may be pipelined on one connection. A request that takes
+    longer than timeout seconds, waiting for a connection included, fails
+    with asyncio.TimeoutError.
+    """
+
+    def __init__(self, limit: int = 100, depth: int = 1, keep_alive: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.limit = limit
+        self.depth = max(1, depth)
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._pools: Dict[Tuple[str, int], _OriginPool] = {}
+        self._templates: Dict[str, RequestTemplates] = {}
+
+    def templates(self, base_url: str) -> RequestTemplates:
+        if base_url not in self._templates:
+            self._templates[base_url] = RequestTemplates(urlparse(base_url).netloc, self.keep_alive)
+        return self._templates[base_url]
+
+    async def send(self, base_url: str, request: bytes, keep_body: bool = True,
+                   marks: Optional[Dict] = None) -> Tuple[int, Optional[bytes], int]:
+        """Send a pre-serialised request and return (status, body or None, body bytes received).
+
+        marks, if given, collects the request's phase timestamps (see clientmonitor.phase_durations).
+        """
+        return await asyncio.wait_for(self._send(base_url, request, keep_body, marks), self.timeout)
+
+    async def _send(self, base_url: str, request: bytes, keep_body: bool,
+                    marks: Optional[Dict]) -> Tuple[int, Optional[bytes], int]:
+        mark(marks, "start")
+        parsed = urlparse(base_url)
+        key = (parsed.hostname, parsed.port or 80)
+        if key not in self._pools:
+            self._pools[key] = _OriginPool(key[0], key[1], self.limit, self.depth)
+        connection = await self._pools[key].acquire(marks)
+        try:
+            return await connection.send(request, keep_body, marks)
+        except asyncio.CancelledError:
+            # Timed out mid-response: whatever the server sends next belongs to this request,
+            # so the connection cannot be reused
+            connection.close()
+            raise
+
+    async def close(self):
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    async def __aenter__(self) -> "RawSession":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional, Tuple
+from export import load_results
+from metrics import LatencyHistogram
+from significance import mean, welch_t_test, welch_t_test_samples
+
+# Metrics checked for regressions and whether a higher value is better
+REGRESSION_METRICS = [
+    ("req_per_sec", True),
+    ("mean", False),
+    ("p99", False),
+]
+
+
+def group_records(runs: List[Tuple[Dict, List[Dict]]]) -> Dict[tuple, List[Dict]]:
+    """Group the records of several runs by (server, phase, operation)"""
+    grouped = {}
+    for _, records in runs:
+        for record in records:
+            grouped.setdefault((record["server"], record["phase"], record["operation"]), []).append(record)
+    return grouped
+
+
+def _merged_histogram(records: List[Dict]) -> Optional[LatencyHistogram]:
+    histograms = [record["histogram"] for record in records if record.get("histogram")]
+    if not histograms:
+        return None
+    merged = LatencyHistogram(histograms[0].min_value, histograms[0].max_value, histograms[0].precision)
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
+
+
+def _p_value(metric: str, baseline: List[Dict], candidate: List[Dict]) -> Optional[float]:
+    """p-value for a difference in the metric, or None when there is not enough data to test it.
+
+    With two or more runs on each side the per-run values are compared, which
+    captures run-to-run noise. Otherwise only the mean latency can be tested,
+    using the per-request samples summarized in the histograms.
+    """
+    if len(baseline) >= 2 and len(candidate) >= 2:
+        test = welch_t_test_samples([r["stats"][metric] for r in baseline], [r["stats"][metric] for r in candidate])
+    elif metric == "mean":
+        before, after = _merged_histogram(baseline), _merged_histogram(candidate)
+        if not before or not after:
+            return None
+        test = welch_t_test(before.mean, before.stdev, before.count, after.mean, after.stdev, after.count)
+    else:
+        return None
+    return test[2] if test else None
+
+
+def compare_runs(baseline_runs: List[Tuple[Dict, List[Dict]]], candidate_runs: List[Tuple[Dict, List[Dict]]],
+                 alpha: float = 0.05, threshold: float = 0.05) -> List[Dict]:
+    """Compare every (server, phase, operation) present in both sets of runs.
+
+    A change is flagged when it exceeds the relative threshold in the worse
+    direction and is statistically significant at alpha. A change beyond the
+    threshold that cannot be tested (single runs, throughput or P99) is
+    reported as untested rather than as a regression, since one run per side
+    says nothing about run-to-run noise.
+    """
+    baseline_groups = group_records(baseline_runs)
+    candidate_groups = group_records(candidate_runs)
+    findings = []
+
+    for key in baseline_groups:
+        if key not in candidate_groups:
+            continue
+        baseline, candidate = baseline_groups[key], candidate_groups[key]
+        for metric, higher_is_better in REGRESSION_METRICS:
+            before = mean([r["stats"][metric] for r in baseline if metric in r["stats"]])
+            after = mean([r["stats"][metric] for r in candidate if metric in r["stats"]])
+            if not before:
+                continue
+            change = (after - before) / before
+            worse = change < -threshold if higher_is_better else change > threshold
+            better = change > threshold if higher_is_better else change < -threshold
+            p_value = _p_value(metric, baseline, candidate)
+
+            if not (worse or better):
+                verdict = "ok"
+            elif p_value is None:
+                verdict = "untested"
+            elif p_value >= alpha:
+                verdict = "noise"
+            else:
+                verdict = "REGRESSION" if worse else "improved"
+
+            server, phase, operation = key
+            findings.append({
+                "server": server,
+                "phase": phase,
+                "operation": operation,
+                "metric": metric,
+                "baseline": before,
+                "candidate": after,
+                "change": change,
+                "p_value": p_value,
+                "worse": worse,
+                "verdict": verdict,
+            })
+    return findings
+
+
+def print_comparison(findings: List[Dict], baseline_count: int, candidate_count: int):
+    print(f"\n{'='*70}")
+    print("REGRESSION CHECK")
+    print(f"{'='*70}")
+    print(f"Baseline runs: {baseline_count}   Candidate runs: {candidate_count}\n")
+    print(f"  {'Server':<20} {'Phase':<10} {'Operation':<10} {'Metric':<12} {'Baseline':>10} {'Candidate':>10} {'Change':>8} {'p':>8}  Verdict")
+    print(f"  {'-'*105}")
+    for f in findings:
+        p_value = f"{f['p_value']:.3f}" if f["p_value"] is not None else "n/a"
+        marker = "❌ " if f["verdict"] == "REGRESSION" else "⚠ " if f["verdict"] == "untested" and f["worse"] else ""
+        print(f"  {f['server']:<20} {f['phase']:<10} {f['operation']:<10} {f['metric']:<12} "
+              f"{f['baseline']:>10.2f} {f['candidate']:>10.2f} {f['change']:>+8.1%} {p_value:>8}  {marker}{f['verdict']}")
+
+    regressions = [f for f in findings if f["verdict"] == "REGRESSION"]
+    untested = [f for f in findings if f["verdict"] == "untested" and f["worse"]]
+    print()
+    if regressions:
+        print(f"❌ {len(regressions)} significant regression(s) found")
+    else:
+        print("✅ No significant regressions")
+    if untested:
+        print(f"⚠ {len(untested)} change(s) for the worse could not be tested; "
+              f"save two or more runs per side to test them against run-to-run noise")
+    print(f"{'='*70}\n")
+
+
+def compare_files(baseline_paths: List[str], candidate_paths: List[str],
+                  alpha: float = 0.05, threshold: float = 0.05) -> int:
+    """Load saved runs, print the comparison and return a process exit code (1 on regression)"""
+    baseline_runs = [load_results(path) for path in baseline_paths]
+    candidate_runs = [load_results(path) for path in candidate_paths]
+    findings = compare_runs(baseline_runs, candidate_runs, alpha, threshold)
+    print_comparison(findings, len(baseline_runs), len(candidate_runs))
+    return 1 if any(f["verdict"] == "REGRESSION" for f in findings) else 0
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import shlex
+import shutil
+import signal
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+from procfs import ProcessSampler
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Project directory and script name that start each server
+SERVER_SCRIPTS = {
+    "http://localhost:3001": ("crud-node", "native:server"),
+    "http://localhost:3002": ("crud-node", "hono:server"),
+    "http://localhost:3003": ("crud-node", "express:server"),
+    "http://localhost:3004": ("crud-deno", "native:server"),
+    "http://localhost:3005": ("crud-deno", "hono:server"),
+    "http://localhost:3006": ("crud-deno", "express:server"),
+    "http://localhost:3007": ("crud-bun", "native:server"),
+    "http://localhost:3008": ("crud-bun", "hono:server"),
+    "http://localhost:3009": ("crud-bun", "express:server"),
+    "http://localhost:3011": ("crud-node", "native:cluster"),
+    "http://localhost:3012": ("crud-node", "hono:cluster"),
+    "http://localhost:3013": ("crud-node", "express:cluster"),
+    "http://localhost:3014": ("crud-deno", "native:cluster"),
+    "http://localhost:3015": ("crud-deno", "hono:cluster"),
+    "http://localhost:3017": ("crud-bun", "native:cluster"),
+    "http://localhost:3018": ("crud-bun", "hono:cluster"),
+}
+
+# Manifest file and the key its scripts live under, per project
+MANIFESTS = {
+    "crud-node": ("package.json", "scripts"),
+    "crud-deno": ("deno.json", "tasks"),
+    "crud-bun": ("package.json", "scripts"),
+}
+
+
+def server_command(url: str) -> Tuple[str, List[str]]:
+    """Working directory and argv for a server, read from its project's package.json or deno.json.
+
+    The script's command is run directly rather than through npm/deno task/bun
+    run, so the launched PID is the runtime itself and can be sampled and signalled.
+    """
+    project, script = SERVER_SCRIPTS[url]
+    cwd = os.path.join(REPO_ROOT, project)
+    manifest, key = MANIFESTS[project]
+    with open(os.path.join(cwd, manifest), encoding="utf-8") as f:
+        command = json.load(f)[key][script]
+    return cwd, shlex.split(command)
+
+
+def can_launch(url: str) -> bool:
+    """Whether the server's runtime is installed"""
+    if url not in SERVER_SCRIPTS:
+        return False
+    _, argv = server_command(url)
+    return shutil.which(argv[0]) is not None
+
+
+class ManagedServer:
+    """A server process launched and torn down by the benchmark.
+
+    env adds to the inherited environment, e.g. WORKERS for the clustered servers.
+    """
+
+    def __init__(self, url: str, cpus: Optional[List[int]] = None, sample_interval: float = 0.5,
+                 env: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.cpus = cpus
+        self.sample_interval = sample_interval
+        self.env = env
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.stderr = None
+        self.sampler: Optional[ProcessSampler] = None
+        self.startup_time: Optional[float] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    async def _responds(self, session: aiohttp.ClientSession) -> bool:
+        try:
+            async with session.get(f"{self.url}/users", timeout=aiohttp.ClientTimeout(total=0.5)) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def start(self, timeout: float = 30) -> float:
+        """Launch the server and wait for its first successful response.
+
+        Returns the startup latency in seconds: time from spawning the process
+        to the first successful GET /users.
+        """
+        cwd, argv = server_command(self.url)
+        async with aiohttp.ClientSession() as session:
+            if await self._responds(session):
+                raise RuntimeError(f"Something is already listening on {self.url}; stop it first")
+
+            preexec_fn = (lambda: os.sched_setaffinity(0, self.cpus)) if self.cpus else None
+            # A file rather than a pipe, so a chatty server can never block on a full pipe
+            self.stderr = tempfile.TemporaryFile()
+            launched = time.perf_counter()
+            self.process = await asyncio.create_subprocess_exec(
+                *argv, cwd=cwd, stdout=asyncio.subprocess.DEVNULL, stderr=self.stderr,
+                env={**os.environ, **self.env} if self.env else None,
+                preexec_fn=preexec_fn, start_new_session=True
+            )
+
+            while time.perf_counter() - launched < timeout:
+                if self.process.returncode is not None:
+                    self.stderr.seek(0)
+                    lines = self.stderr.read().decode(errors="replace").strip().splitlines()
+                    self.stderr.close()
+                    # Prefer the line naming the error over the tail of a stack trace
+                    reason = next((line for line in lines if "Error" in line), lines[-1] if lines else "")
+                    raise RuntimeError(f"{' '.join(argv)} exited with code {self.process.returncode}: {reason.strip()}")
+                if await self._responds(session):
+                    self.startup_time = time.perf_counter() - launched
+                    self.sampler = ProcessSampler(self.process.pid, self.sample_interval)
+                    return self.startup_time
+                await asyncio.sleep(0.01)
+
+        await self.stop()
+        raise RuntimeError(f"{' '.join(argv)} did not respond within {timeout:g} s")
+
+    async def stop(self, timeout: float = 5):
+        """Stop the server with SIGTERM, escalating to SIGKILL if it does not exit in time"""
+        if self.stderr and not self.stderr.closed:
+            self.stderr.close()
+        if not self.process or self.process.returncode is not None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                # The server runs in its own session, so signal the whole group in case it forked
+                os.killpg(self.process.pid, sig)
+            except ProcessLookupError:
+                break
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout)
+                break
+            except asyncio.TimeoutError:
+                continue
+
+    def start_sampling(self):
+        if self.sampler:
+            self.sampler.start()
+
+    async def stop_sampling(self) -> Dict:
+        return await self.sampler.stop() if self.sampler else {}
@@ -0,0 +1,105 @@
+import math
+from typing import List, Optional, Tuple
+
+
+def _continued_fraction(a: float, b: float, x: float) -> float:
+    """Continued fraction for the regularized incomplete beta function (Numerical Recipes betacf)"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c, d = 1.0, 1 - qab * x / qap
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return h
+
+
+def incomplete_beta(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _continued_fraction(a, b, x) / a
+    return 1 - front * _continued_fraction(b, a, 1 - x) / b
+
+
+def t_two_sided_p(t: float, df: float) -> float:
+    """Two-sided p-value of Student's t statistic"""
+    if math.isinf(df):
+        return math.erfc(abs(t) / math.sqrt(2))
+    return incomplete_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def t_critical(df: float, confidence: float = 0.95) -> float:
+    """Two-sided critical value of Student's t for the confidence level, found by bisection"""
+    alpha = 1 - confidence
+    low, high = 0.0, 1.0
+    while t_two_sided_p(high, df) > alpha:
+        high *= 2
+    for _ in range(100):
+        middle = (low + high) / 2
+        if t_two_sided_p(middle, df) > alpha:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def confidence_interval(values: List[float], confidence: float = 0.95) -> Tuple[float, float]:
+    """Mean of the samples and the half-width of its confidence interval (infinite with fewer than two samples)"""
+    if len(values) < 2:
+        return mean(values), math.inf
+    return mean(values), t_critical(len(values) - 1, confidence) * stdev(values) / math.sqrt(len(values))
+
+
+def welch_t_test(mean_a: float, stdev_a: float, n_a: int,
+                 mean_b: float, stdev_b: float, n_b: int) -> Optional[Tuple[float, float, float]]:
+    """Welch's unequal-variance t-test from summary statistics.
+
+    Returns (t, degrees of freedom, two-sided p) or None when either side has
+    fewer than two samples.
+    """
+    if n_a < 2 or n_b < 2:
+        return None
+    var_a, var_b = stdev_a ** 2 / n_a, stdev_b ** 2 / n_b
+    if var_a + var_b == 0:
+        return (0.0, math.inf, 1.0) if mean_a == mean_b else (math.inf, math.inf, 0.0)
+    t = (mean_b - mean_a) / math.sqrt(var_a + var_b)
+    df_denominator = (var_a ** 2 / (n_a - 1) if var_a else 0) + (var_b ** 2 / (n_b - 1) if var_b else 0)
+    df = (var_a + var_b) ** 2 / df_denominator if df_denominator else math.inf
+    return t, df, t_two_sided_p(t, df)
+
+
+def welch_t_test_samples(a: List[float], b: List[float]) -> Optional[Tuple[float, float, float]]:
+    """Welch's t-test on two lists of samples"""
+    return welch_t_test(mean(a), stdev(a), len(a), mean(b), stdev(b), len(b))
+
+
+def mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0
+
+
+def stdev(values: List[float]) -> float:
+    """Sample standard deviation"""
+    if len(values) < 2:
+        return 0
+    average = mean(values)
+    return math.sqrt(sum((v - average) ** 2 for v in values) / (len(values) - 1))
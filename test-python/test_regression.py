@@ -0,0 +1,39 @@
+from regression import compare_files, compare_runs
+from export import write_results
+
+
+def _run(req_per_sec: float, p99: float = 10.0, mean: float = 5.0):
+    return {}, [{
+        "server": "Node.js (native)",
+        "phase": "stress",
+        "operation": "ALL",
+        "stats": {"req_per_sec": req_per_sec, "mean": mean, "p99": p99},
+        "histogram": None,
+    }]
+
+
+def _verdict(findings, metric: str) -> str:
+    return next(f["verdict"] for f in findings if f["metric"] == metric)
+
+
+def test_single_run_throughput_drop_is_untested(tmp_path):
+    baseline, candidate = tmp_path / "baseline.json", tmp_path / "candidate.json"
+    write_results(str(baseline), *_run(1000.0))
+    write_results(str(candidate), *_run(940.0))
+
+    assert compare_files([str(baseline)], [str(candidate)]) == 0
+    assert _verdict(compare_runs([_run(1000.0)], [_run(940.0)]), "req_per_sec") == "untested"
+
+
+def test_repeated_runs_throughput_drop_is_a_regression():
+    baseline = [_run(1000.0), _run(1002.0), _run(998.0)]
+    candidate = [_run(940.0), _run(942.0), _run(938.0)]
+
+    assert _verdict(compare_runs(baseline, candidate), "req_per_sec") == "REGRESSION"
+
+
+def test_repeated_runs_within_noise_are_not_a_regression():
+    baseline = [_run(1000.0), _run(1100.0), _run(900.0)]
+    candidate = [_run(940.0), _run(1040.0), _run(840.0)]
+
+    assert _verdict(compare_runs(baseline, candidate), "req_per_sec") == "noise"
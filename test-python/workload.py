@@ -0,0 +1,187 @@
+import bisect
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+# Built-in workloads, selectable by name instead of a JSON file
+WORKLOADS = {
+    # Roughly 90% reads concentrated on a hot subset of users
+    "read-heavy": {
+        "mix": {"GET_ONE": 90, "UPDATE": 5, "CREATE": 3, "DELETE": 1, "GET_ALL": 1},
+        "key_distribution": "zipfian",
+        "prepopulate": 1000,
+    },
+    "write-heavy": {
+        "mix": {"GET_ONE": 40, "UPDATE": 40, "CREATE": 10, "DELETE": 10},
+        "key_distribution": "uniform",
+        "prepopulate": 1000,
+    },
+    # Recently created users are read the most, like a feed or timeline
+    "read-latest": {
+        "mix": {"GET_ONE": 90, "CREATE": 10},
+        "key_distribution": "latest",
+        "prepopulate": 1000,
+    },
+}
+
+KEY_DISTRIBUTIONS = ("uniform", "zipfian", "latest")
+
+# Operations a mix can weight, named as in the benchmark results
+MIX_OPERATIONS = ("CREATE", "GET_ALL", "GET_ONE", "UPDATE", "DELETE")
+
+# Operations that act on an existing user and so need a key
+KEYED_OPERATIONS = ("GET_ONE", "UPDATE", "DELETE")
+
+DEFAULT_ZIPF_THETA = 0.99
+
+
+class ZipfianRanks:
+    """Zipfian ranks over a population that grows and shrinks (Gray et al., "Quickly Generating Billion-Record Synthetic Databases").
+
+    Rank 0 is the most popular. The zeta normalisation is updated one term at a
+    time as the population changes, so each draw stays O(1).
+    """
+
+    def __init__(self, theta: float = DEFAULT_ZIPF_THETA, rng: Optional[random.Random] = None):
+        if not 0 < theta < 1:
+            raise ValueError(f"zipf_theta must be between 0 and 1, got {theta}")
+        self.theta = theta
+        self.alpha = 1 / (1 - theta)
+        self.zeta2 = 1 + 0.5 ** theta
+        self.rng = rng or random.Random()
+        self.n = 0
+        self.zetan = 0.0
+
+    def _resize(self, n: int):
+        while self.n < n:
+            self.n += 1
+            self.zetan += 1 / self.n ** self.theta
+        while self.n > n:
+            self.zetan -= 1 / self.n ** self.theta
+            self.n -= 1
+
+    def rank(self, n: int) -> int:
+        """Draw a rank in [0, n)"""
+        self._resize(n)
+        u = self.rng.random()
+        uz = u * self.zetan
+        if uz < 1:
+            return 0
+        if uz < self.zeta2:
+            return 1
+        eta = (1 - (2 / n) ** (1 - self.theta)) / (1 - self.zeta2 / self.zetan)
+        return min(n - 1, int(n * (eta * u - eta + 1) ** self.alpha))
+
+
+class KeySpace:
+    """The user IDs a load generator knows about, in creation order, and how it picks among them.
+
+      uniform   every user is equally likely
+      zipfian   popularity follows a Zipf law, the earliest created users being hottest
+      latest    Zipfian, but the most recently created users are hottest
+    """
+
+    def __init__(self, ids: List[int], distribution: str = "uniform", theta: float = DEFAULT_ZIPF_THETA,
+                 rng: Optional[random.Random] = None):
+        self.ids = list(ids)
+        self.distribution = distribution
+        self.rng = rng or random.Random()
+        self.zipf = ZipfianRanks(theta, self.rng) if distribution != "uniform" else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, user_id: int):
+        self.ids.append(user_id)
+
+    def _index(self) -> int:
+        if self.distribution == "uniform":
+            return self.rng.randrange(len(self.ids))
+        rank = self.zipf.rank(len(self.ids))
+        return len(self.ids) - 1 - rank if self.distribution == "latest" else rank
+
+    def choose(self) -> Optional[int]:
+        return self.ids[self._index()] if self.ids else None
+
+    def take(self) -> Optional[int]:
+        """Choose a user and forget it, so no other request picks a user that is being deleted"""
+        return self.ids.pop(self._index()) if self.ids else None
+
+
+class Workload:
+    """A declarative workload: operation weights, key distribution, pre-population size and think time"""
+
+    def __init__(self, mix: Dict[str, float], key_distribution: str = "uniform", zipf_theta: float = DEFAULT_ZIPF_THETA,
+                 prepopulate: int = 0, think_time_ms: float = 0, name: str = "custom"):
+        unknown = set(mix) - set(MIX_OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operation(s) in mix: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+            raise ValueError("Operation weights must be non-negative and not all zero")
+        if key_distribution not in KEY_DISTRIBUTIONS:
+            raise ValueError(f"key_distribution must be one of {', '.join(KEY_DISTRIBUTIONS)}, got {key_distribution!r}")
+        if key_distribution != "uniform" and not 0 < zipf_theta < 1:
+            raise ValueError(f"zipf_theta must be between 0 and 1, got {zipf_theta}")
+        if prepopulate < 0 or think_time_ms < 0:
+            raise ValueError("prepopulate and think_time_ms must not be negative")
+
+        self.name = name
+        self.mix = {operation: weight for operation, weight in mix.items() if weight > 0}
+        self.key_distribution = key_distribution
+        self.zipf_theta = zipf_theta
+        self.prepopulate = int(prepopulate)
+        self.think_time_ms = think_time_ms
+        self._operations = list(self.mix)
+        self._cumulative = []
+        total = 0
+        for operation in self._operations:
+            total += self.mix[operation]
+            self._cumulative.append(total)
+
+    def choose_operation(self, rng: random.Random) -> str:
+        return self._operations[bisect.bisect_right(self._cumulative, rng.random() * self._cumulative[-1])]
+
+    def key_space(self, ids: List[int], rng: Optional[random.Random] = None) -> KeySpace:
+        return KeySpace(ids, self.key_distribution, self.zipf_theta, rng)
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "mix": self.mix,
+            "key_distribution": self.key_distribution,
+            "zipf_theta": self.zipf_theta,
+            "prepopulate": self.prepopulate,
+            "think_time_ms": self.think_time_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, spec: Dict, name: str = "custom") -> "Workload":
+        spec = dict(spec)
+        if "mix" not in spec:
+            raise ValueError("A workload needs a \"mix\" of operation weights")
+        spec.setdefault("name", name)
+        try:
+            return cls(**spec)
+        except TypeError as e:
+            raise ValueError(f"Invalid workload spec: {e}") from None
+
+    def describe(self) -> str:
+        total = sum(self.mix.values())
+        mix = ", ".join(f"{operation} {weight / total:.0%}" for operation, weight in self.mix.items())
+        keys = self.key_distribution if self.key_distribution == "uniform" else f"{self.key_distribution} (theta {self.zipf_theta:g})"
+        return f"{self.name}: {mix}; keys {keys}; {self.prepopulate} pre-populated users; think time {self.think_time_ms:g} ms"
+
+
+def load_workload(name_or_path: str) -> Workload:
+    """A built-in workload by name, or one read from a JSON file"""
+    if name_or_path in WORKLOADS:
+        return Workload.from_dict(WORKLOADS[name_or_path], name_or_path)
+    if not os.path.exists(name_or_path):
+        raise ValueError(f"{name_or_path!r} is neither a built-in workload ({', '.join(WORKLOADS)}) nor a file")
+    with open(name_or_path, encoding="utf-8") as f:
+        try:
+            spec = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{name_or_path} is not valid JSON: {e}") from None
+    return Workload.from_dict(spec, os.path.splitext(os.path.basename(name_or_path))[0])